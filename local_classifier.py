@@ -0,0 +1,201 @@
+import re
+
+# Minimum confidence for a local label to be served instead of calling Groq
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+
+# Messages longer than this are never short-circuited - they usually carry context the LLM should read
+_MAX_WORDS = 6
+_MAX_CHARS = 60
+
+_EMOJI_POSITIVE = "👍🙏❤😊😀😁😃😄🥰😍👌🎉💯✅"
+_EMOJI_NEGATIVE = "👎😡😠🤬😤😞😢😭💔"
+
+# Whole-message acknowledgements (English + Hindi/Hinglish)
+_POSITIVE_ACK = (
+    r"thanks?( you)?( so much| a lot)?|thank u|thx|ty|tysm|great|awesome|perfect|excellent|amazing|"
+    r"love it|loved it|nice|good job|well done|superb|dhanyavad|dhanyawad|shukriya|bahut badhiya|"
+    r"badhiya|mast|zabardast|shandaar|धन्यवाद|शुक्रिया|बहुत बढ़िया"
+)
+_NEUTRAL_ACK = (
+    r"ok|okay|okk+|k|kk|hmm+|hi|hii+|hello|hey|noted|sure|fine|yes|yeah|yep|no|nope|done|"
+    r"got it|alright|namaste|namaskar|theek hai|thik hai|haan|ha|accha|acha|ji|नमस्ते|ठीक है|हाँ"
+)
+_TRAILER = r"[\s!.,🙂\ufe0f" + _EMOJI_POSITIVE + r"]*"
+
+_POSITIVE_RE = re.compile(rf"^\s*(?:{_POSITIVE_ACK}){_TRAILER}$", re.IGNORECASE)
+_NEUTRAL_RE = re.compile(rf"^\s*(?:{_NEUTRAL_ACK})[\s!?.,🙂\ufe0f]*$", re.IGNORECASE)
+_POSITIVE_EMOJI_ONLY_RE = re.compile(rf"^[\s\ufe0f{_EMOJI_POSITIVE}]+$")
+_NEGATIVE_EMOJI_ONLY_RE = re.compile(rf"^[\s\ufe0f{_EMOJI_NEGATIVE}]+$")
+
+# Negative markers anywhere in a short message: polarity words are negative on their own,
+# action words ("refund", "cancel") only when the message is emphatic ("refund now!!!").
+# Words that are also common in neutral Hinglish ("chor do" = "leave it") are deliberately left out.
+_NEGATIVE_RE = re.compile(
+    r"\b(?:worst|terrible|horrible|pathetic|useless|scam|fraud|cheat(?:ed|ing)?|disgusting|"
+    r"bakwas|bekaar|bekar|ghatiya|dhokha)\b|बकवास|बेकार|घटिया|धोखा|[" + _EMOJI_NEGATIVE + "]",
+    re.IGNORECASE
+)
+_NEGATIVE_ACTION_RE = re.compile(
+    r"\b(?:refund|cancel(?:led)?|unsubscribe|stop (?:messaging|sending)|paisa wapas)\b",
+    re.IGNORECASE
+)
+_POSITIVE_MARKER_RE = re.compile(
+    r"\b(?:thanks?|thank|great|awesome|perfect|love|excellent|amazing|happy|satisfied|good|best)\b",
+    re.IGNORECASE
+)
+# Negation flips or softens a marker ("not a scam", "no, the best") - leave those to the LLM
+_NEGATION_RE = re.compile(
+    r"\b(?:no|not|never|don'?t|doesn'?t|didn'?t|isn'?t|wasn'?t|won'?t|nahi|nahin|mat)\b|नहीं",
+    re.IGNORECASE
+)
+# Emphasis strong enough to make an action word negative: repeated "!" or shouting
+_EMPHATIC_RE = re.compile(r"!{2,}|\b[A-Z]{4,}\b")
+
+# Deterministic business intelligence per label, following the single-message prompt's business rules
+_RULE_TABLE = {
+    "positive": {
+        "sentiment": "positive",
+        "reasoning": "Short positive acknowledgement detected by local classifier",
+        "alert_level": "low",
+        "churn_probability": 10,
+        "revenue_risk": "safe",
+        "purchase_intent": 30,
+        "customer_value_tier": "medium_value",
+        "retention_action": "none",
+        "cost_prediction": {
+            "optimal_conversation_type": "service",
+            "predicted_cost": "₹0.00",
+            "cost_saved": "₹0.00",
+            "reasoning": "Acknowledgement within an open conversation - reply in the free service window"
+        },
+        "response_prediction": {
+            "success_probability": 90,
+            "best_response_time": "within_24_hours",
+            "escalation_probability": 5,
+            "resolution_likelihood": "high"
+        },
+        "template_recommendation": {
+            "primary_category": "service",
+            "confidence": 80,
+            "cost_impact": "₹0.00",
+            "avoid_categories": ["authentication"],
+            "reasoning": "No purchase signal - a free service reply is sufficient"
+        }
+    },
+    "neutral": {
+        "sentiment": "neutral",
+        "reasoning": "Short neutral acknowledgement detected by local classifier",
+        "alert_level": "low",
+        "churn_probability": 20,
+        "revenue_risk": "safe",
+        "purchase_intent": 20,
+        "customer_value_tier": "medium_value",
+        "retention_action": "none",
+        "cost_prediction": {
+            "optimal_conversation_type": "utility",
+            "predicted_cost": "₹0.125",
+            "cost_saved": "₹0.00",
+            "reasoning": "Neutral message - informational utility follow-up"
+        },
+        "response_prediction": {
+            "success_probability": 80,
+            "best_response_time": "within_24_hours",
+            "escalation_probability": 5,
+            "resolution_likelihood": "high"
+        },
+        "template_recommendation": {
+            "primary_category": "utility",
+            "confidence": 75,
+            "cost_impact": "₹0.125",
+            "avoid_categories": ["marketing"],
+            "reasoning": "Neutral sentiment maps to the utility category"
+        }
+    },
+    "negative": {
+        "sentiment": "negative",
+        "reasoning": "Strong negative marker detected by local classifier",
+        "alert_level": "high",
+        "churn_probability": 75,
+        "revenue_risk": "high_risk",
+        "purchase_intent": 5,
+        "customer_value_tier": "medium_value",
+        "retention_action": "manager_call",
+        "cost_prediction": {
+            "optimal_conversation_type": "service",
+            "predicted_cost": "₹0.00",
+            "cost_saved": "₹0.88",
+            "reasoning": "Negative sentiment - resolve in the free service category, never marketing"
+        },
+        "response_prediction": {
+            "success_probability": 40,
+            "best_response_time": "immediate",
+            "escalation_probability": 60,
+            "resolution_likelihood": "medium"
+        },
+        "template_recommendation": {
+            "primary_category": "service",
+            "confidence": 85,
+            "cost_impact": "₹0.00",
+            "avoid_categories": ["marketing"],
+            "reasoning": "Never send marketing to an angry customer - focus on problem resolution"
+        }
+    }
+}
+
+class LocalSentimentClassifier:
+    """
+    Rule-based pre-classifier for trivially classifiable messages ("thanks", "ok", "👍", "refund now!!!")
+    """
+
+    def __init__(self, confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD):
+        self.confidence_threshold = confidence_threshold
+        self._hits = 0
+        self._lookups = 0
+
+    def _label(self, message: str):
+        """
+        Return (label, confidence) for the message, or (None, 0.0) when it is not trivial
+        """
+        text = message.strip()
+        if not text or len(text) > _MAX_CHARS or len(text.split()) > _MAX_WORDS:
+            return None, 0.0
+
+        if _POSITIVE_RE.match(text) or _POSITIVE_EMOJI_ONLY_RE.match(text):
+            return "positive", 0.9
+        if _NEGATIVE_EMOJI_ONLY_RE.match(text):
+            return "negative", 0.9
+        if _NEUTRAL_RE.match(text):
+            return "neutral", 0.85
+
+        # Short message with a negative marker and no positive one ("worst service", "refund now!!!").
+        # Questions ("is this a scam?") and negation ("not bad") are never decided locally.
+        if "?" in text or _NEGATION_RE.search(text) or _POSITIVE_MARKER_RE.search(text):
+            return None, 0.0
+        
+        emphatic = _EMPHATIC_RE.search(text) is not None
+        if _NEGATIVE_RE.search(text):
+            return "negative", 0.9 if emphatic else 0.85
+        if _NEGATIVE_ACTION_RE.search(text):
+            return "negative", 0.85 if emphatic else 0.6
+
+        return None, 0.0
+
+    def classify(self, message: str):
+        """
+        Return a parsed-response dict (same shape as the LLM JSON) for confident labels, else None
+        """
+        self._lookups += 1
+        label, confidence = self._label(message)
+        if label is None or confidence < self.confidence_threshold:
+            return None
+
+        self._hits += 1
+        return {**_RULE_TABLE[label], "confidence_score": confidence}
+
+    def stats(self) -> dict:
+        return {
+            "confidence_threshold": self.confidence_threshold,
+            "hits": self._hits,
+            "lookups": self._lookups,
+            "hit_rate": round(self._hits / self._lookups, 4) if self._lookups else 0.0
+        }
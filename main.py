@@ -1,15 +1,39 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from models import MessageRequest, BulkMessageRequest, SentimentResponse, BulkSentimentResponse
 from sentiment_analyzer import SentimentAnalyzer
 import uvicorn
+import httpx
+import orjson
+import os
+import sys
+from contextlib import asynccontextmanager
 from datetime import datetime
 
+# Shared HTTP client for Groq calls - keeps TCP+TLS connections alive across requests
+groq_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=1000, max_keepalive_connections=1000, keepalive_expiry=60)
+)
+
+# Initialize sentiment analyzer
+analyzer = SentimentAnalyzer(http_async_client=groq_http_client)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Release pooled Groq connections on shutdown
+    """
+    yield
+    await groq_http_client.aclose()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AiSensy Sentiment Analysis API - Performance Optimized",
     description="Production-ready sentiment analysis for customer chat messages using LangChain + ChatGroq with advanced business intelligence and performance optimization",
-    version="1.1.0"
+    version="1.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware for frontend integration
@@ -21,9 +45,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize sentiment analyzer
-analyzer = SentimentAnalyzer()
-
 @app.get("/")
 async def root():
     """
@@ -66,7 +87,7 @@ async def analyze_sentiment(request: MessageRequest):
         if not request.timestamp:
             request.timestamp = datetime.now().isoformat()
         
-        result = analyzer.analyze_message(
+        result = await analyzer.analyze_message(
             message=request.message,
             customer_id=request.customer_id,
             agent_id=request.agent_id,
@@ -75,9 +96,32 @@ async def analyze_sentiment(request: MessageRequest):
         
         return result
         
+    except HTTPException:
+        # Validation errors (400) pass through unchanged
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sentiment analysis failed: {str(e)}")
 
+def _prepare_bulk_messages(request: BulkMessageRequest):
+    """
+    Validate a bulk request and normalize its messages in place
+    """
+    if not request.messages or len(request.messages) == 0:
+        raise HTTPException(status_code=400, detail="Messages list cannot be empty")
+    
+    if len(request.messages) > 15:  # Reduced limit for better performance
+        raise HTTPException(
+            status_code=400, 
+            detail="Maximum 15 messages allowed per bulk request for optimal performance. For larger datasets, use multiple smaller requests."
+        )
+    
+    # Add timestamps for messages that don't have them
+    for msg in request.messages:
+        if not msg.timestamp:
+            msg.timestamp = datetime.now().isoformat()
+        if len(msg.message) > 2000:
+            msg.message = msg.message[:2000] + "..."
+
 @app.post("/analyze-bulk", response_model=BulkSentimentResponse)
 async def analyze_bulk_sentiment(request: BulkMessageRequest):
     """
@@ -90,29 +134,57 @@ async def analyze_bulk_sentiment(request: BulkMessageRequest):
         BulkSentimentResponse with results and enhanced business intelligence summary
     """
     try:
-        if not request.messages or len(request.messages) == 0:
-            raise HTTPException(status_code=400, detail="Messages list cannot be empty")
+        _prepare_bulk_messages(request)
         
-        if len(request.messages) > 15:  # Reduced limit for better performance
-            raise HTTPException(
-                status_code=400, 
-                detail="Maximum 15 messages allowed per bulk request for optimal performance. For larger datasets, use multiple smaller requests."
-            )
-        
-        # Add timestamps for messages that don't have them
-        for msg in request.messages:
-            if not msg.timestamp:
-                msg.timestamp = datetime.now().isoformat()
-            if len(msg.message) > 2000:
-                msg.message = msg.message[:2000] + "..."
-        
-        result = analyzer.analyze_bulk_messages(request.messages)
+        result = await analyzer.analyze_bulk_messages(request.messages)
         
         return BulkSentimentResponse(
             results=result["results"],
             summary=result["summary"]
         )
         
+    except HTTPException:
+        # Validation errors (400) pass through unchanged
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk sentiment analysis failed: {str(e)}")
+
+@app.post("/analyze-bulk/stream")
+async def analyze_bulk_sentiment_stream(request: BulkMessageRequest):
+    """
+    Streaming variant of /analyze-bulk - newline-delimited JSON
+    
+    Each result is emitted as {"index": i, "result": {...}} as soon as it is ready
+    (in completion order), followed by a final {"summary": {...}} line.
+    """
+    _prepare_bulk_messages(request)
+    
+    async def ndjson_lines():
+        async for kind, index, payload in analyzer.stream_bulk_messages(request.messages):
+            if kind == "result":
+                yield orjson.dumps({"index": index, "result": payload.model_dump()}) + b"\n"
+            else:
+                yield orjson.dumps({"summary": payload}) + b"\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+@app.post("/analyze-bulk/summary")
+async def analyze_bulk_sentiment_summary(request: BulkMessageRequest):
+    """
+    Summary-only variant of /analyze-bulk - returns {"summary": {...}} without the per-message results
+    
+    For dashboards and clients that only read the aggregate: the results array is never serialized or sent.
+    """
+    try:
+        _prepare_bulk_messages(request)
+        
+        result = await analyzer.analyze_bulk_messages(request.messages)
+        
+        return {"summary": result["summary"]}
+        
+    except HTTPException:
+        # Validation errors (400) pass through unchanged
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Bulk sentiment analysis failed: {str(e)}")
 
@@ -123,7 +195,7 @@ async def health_check():
     """
     try:
         # Test the analyzer with a simple message
-        test_result = analyzer.analyze_message("Hello, this is a test message for health check")
+        test_result = await analyzer.analyze_message("Hello, this is a test message for health check")
         
         return {
             "status": "healthy",
@@ -159,7 +231,7 @@ async def aisensy_chat_analysis(request: MessageRequest):
         if not cleaned_message:
             raise HTTPException(status_code=400, detail="Message cannot be empty")
             
-        result = analyzer.analyze_message(
+        result = await analyzer.analyze_message(
             message=cleaned_message,
             customer_id=request.customer_id,
             agent_id=request.agent_id,
@@ -204,9 +276,26 @@ async def aisensy_chat_analysis(request: MessageRequest):
             "processed_at": datetime.now().isoformat()
         }
         
+    except HTTPException:
+        # Validation errors (400) pass through unchanged
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AiSensy chat analysis failed: {str(e)}")
 
+# Prompt cache monitoring endpoint
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    Exact-match prompt cache statistics
+    """
+    return {
+        "prompt_cache": analyzer.cache_stats(),
+        # Each uvicorn worker process has its own caches - these figures cover this worker only
+        "stats_scope": "per-worker",
+        "worker_pid": os.getpid(),
+        "timestamp": datetime.now().isoformat()
+    }
+
 # Performance monitoring endpoint
 @app.get("/performance")
 async def performance_stats():
@@ -220,8 +309,12 @@ async def performance_stats():
             "individual_fallback": "Progressive processing for larger batches",
             "message_limits": "15 messages max per bulk request",
             "character_limits": "2000 characters max per message",
-            "response_time": "~2-5 seconds for single message, ~10-15 seconds for bulk"
+            "response_time": "~2-5 seconds for single message, ~10-15 seconds for bulk",
+            "local_classifier": analyzer.local_classifier.stats()
         },
+        # Counters above are kept per uvicorn worker process, not across the whole server
+        "stats_scope": "per-worker",
+        "worker_pid": os.getpid(),
         "business_intelligence_features": [
             "Churn probability prediction",
             "Revenue risk assessment", 
@@ -234,10 +327,24 @@ async def performance_stats():
         "integration_ready": {
             "aisensy_endpoint": "/aisensy/chat-analysis",
             "bulk_endpoint": "/analyze-bulk", 
+            "bulk_stream_endpoint": "/analyze-bulk/stream",
+            "bulk_summary_endpoint": "/analyze-bulk/summary",
             "single_endpoint": "/analyze-sentiment",
-            "health_check": "/health"
+            "health_check": "/health",
+            "cache_stats": "/cache/stats"
         }
     }
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # Production server: one event loop per worker, each overlapping many in-flight Groq calls.
+    # Workers share nothing - each keeps its own prompt cache and stats counters
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=max(2, os.cpu_count() or 1),
+        loop="uvloop" if sys.platform != "win32" else "asyncio",  # uvloop does not support Windows
+        http="httptools",
+        log_level="warning",
+        access_log=False
+    )
\ No newline at end of file
@@ -1,41 +1,81 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, model_validator
+from typing import Annotated, Optional, List
 from enum import Enum
 
+def _round_number(value):
+    """
+    Accept fractional LLM scores ("churn_probability": 75.5) for int fields by rounding them
+    """
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return value
+    if isinstance(value, float):
+        return round(value)
+    return value
+
+# int that also accepts floats and numeric strings - pydantic v2 rejects 75.5 for a plain int
+LenientInt = Annotated[int, BeforeValidator(_round_number)]
+
 class SentimentType(str, Enum):
     POSITIVE = "positive"
     NEGATIVE = "negative"
     NEUTRAL = "neutral"
 
 class MessageRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    
     message: str
     customer_id: Optional[str] = None
     agent_id: Optional[str] = None
     timestamp: Optional[str] = None
 
 class BulkMessageRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    
     messages: List[MessageRequest]
 
 class CostPrediction(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    
     optimal_conversation_type: str
     predicted_cost: str
     cost_saved: str
     reasoning: str
+    
+    # Numeric cost_saved, parsed once at construction (not part of the API response)
+    cost_saved_value: float = Field(default=0.0, exclude=True)
+    
+    @model_validator(mode='after')
+    def parse_cost_saved(self):
+        try:
+            self.cost_saved_value = float(self.cost_saved.strip().lstrip('₹').strip())
+        except ValueError:
+            # Non-numeric values (e.g. an echoed "₹0.00/₹0.88" range) count as no savings
+            self.cost_saved_value = 0.0
+        return self
 
 class ResponsePrediction(BaseModel):
-    success_probability: int
+    model_config = ConfigDict(extra='ignore')
+    
+    success_probability: LenientInt
     best_response_time: str
-    escalation_probability: int
+    escalation_probability: LenientInt
     resolution_likelihood: str
 
 class TemplateRecommendation(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    
     primary_category: str
-    confidence: int
+    confidence: LenientInt
     cost_impact: str
     avoid_categories: List[str]
     reasoning: str
 
 class SentimentResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    
     message: str
     sentiment: SentimentType
     confidence_score: float
@@ -46,9 +86,9 @@ class SentimentResponse(BaseModel):
     alert_level: str
     
     # Business Intelligence Parameters
-    churn_probability: int
+    churn_probability: LenientInt
     revenue_risk: str
-    purchase_intent: int
+    purchase_intent: LenientInt
     customer_value_tier: str
     retention_action: str
     
@@ -58,5 +98,7 @@ class SentimentResponse(BaseModel):
     template_recommendation: TemplateRecommendation
 
 class BulkSentimentResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    
     results: List[SentimentResponse]
     summary: dict
\ No newline at end of file
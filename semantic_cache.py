@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+
+# Optional dependencies - the semantic cache is disabled when they are not installed
+try:
+    import numpy as np
+    import faiss
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    np = None
+    faiss = None
+    SentenceTransformer = None
+
+# Cosine similarity at or above which two messages are treated as the same query.
+# all-MiniLM-L6-v2 puts close paraphrases ("where is my package" / "my order hasn't arrived")
+# at ~0.92+, while messages that merely share a topic but differ in intent or polarity
+# ("order arrived, thanks!" vs "order never arrived") typically land at 0.7-0.85.
+# Lowering the threshold raises the hit rate at the cost of serving a wrong cached analysis.
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+class SemanticCache:
+    """
+    Near-duplicate message cache backed by sentence embeddings and a FAISS inner-product index
+    
+    Safe to call from worker threads: embedding runs unlocked, index access is serialized.
+    """
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", max_entries: int = 50_000,
+                 threshold: float = DEFAULT_SIMILARITY_THRESHOLD):
+        self.model = SentenceTransformer(model_name)
+        self.max_entries = max_entries
+        self.threshold = threshold
+
+        # Inner product over L2-normalized embeddings == cosine similarity
+        dimension = self.model.get_sentence_embedding_dimension()
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+
+        # FAISS id -> parsed LLM JSON, in insertion order for FIFO eviction
+        self._entries: OrderedDict[int, dict] = OrderedDict()
+        self._next_id = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return faiss is not None
+
+    def _embed(self, message: str):
+        embedding = self.model.encode([message.strip()], normalize_embeddings=True)
+        return np.asarray(embedding, dtype=np.float32)
+
+    def lookup(self, message: str, threshold: float = None):
+        """
+        Return the cached parsed response of the nearest neighbour if it is similar enough
+        """
+        threshold = self.threshold if threshold is None else threshold
+        embedding = self._embed(message)
+
+        with self._lock:
+            if self.index.ntotal > 0:
+                scores, ids = self.index.search(embedding, 1)
+                if ids[0][0] != -1 and scores[0][0] >= threshold:
+                    self._hits += 1
+                    return self._entries[int(ids[0][0])]
+
+            self._misses += 1
+            return None
+
+    def add(self, message: str, parsed_response: dict):
+        """
+        Store a parsed response, evicting the oldest entry once the index is full
+        """
+        embedding = self._embed(message)
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                oldest_id, _ = self._entries.popitem(last=False)
+                self.index.remove_ids(np.array([oldest_id], dtype=np.int64))
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self.index.add_with_ids(embedding, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = parsed_response
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_entries,
+            "threshold": self.threshold,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+        }
@@ -1,22 +1,258 @@
 import os
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, OrderedDict
+import numpy as np
+import groq
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from langchain_groq import ChatGroq
 from langchain.prompts import PromptTemplate
 from langchain.schema import HumanMessage
+from semantic_cache import SemanticCache
+from local_classifier import LocalSentimentClassifier
 from models import SentimentResponse, SentimentType, CostPrediction, ResponsePrediction, TemplateRecommendation
-import json
+import orjson
 import re
 from dotenv import load_dotenv
 
+# Optional JIT for the summary reduction - falls back to NumPy when numba is not installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Load environment variables
 load_dotenv()
 
+# Thread pool for blocking CPU work (embedding, FAISS search) so it never stalls the event loop
+_POOL = ThreadPoolExecutor(max_workers=32)
+
+# Compiled once - used to strip extra text around the LLM's JSON output
+_JSON_OBJ_RE = re.compile(r'\{.*\}', re.DOTALL)
+_JSON_ARR_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+# Escapes double quotes so a message cannot break out of its quoted slot in the prompt
+_QUOTE_ESCAPE_TABLE = str.maketrans({'"': '\\"'})
+_PROMPT_SENTINEL = "\x00PROMPT_VARIABLE\x00"
+
+# Casings the LLM commonly emits, so the hot path can skip .lower() + enum construction
+_SENTIMENT_MAP = {
+    variant: sentiment
+    for sentiment in SentimentType
+    for variant in (sentiment.value, sentiment.value.capitalize(), sentiment.value.upper())
+}
+_ALERT_LEVEL_MAP = {
+    variant: level
+    for level in ("low", "medium", "high")
+    for variant in (level, level.capitalize(), level.upper())
+}
+
+# Small integer codes for the categorical fields fed into the summary reduction
+_TIER_CODES = {"low_value": 0, "medium_value": 1, "high_value": 2, "vip": 3}
+_CATEGORY_CODES = {"service": 0, "utility": 1, "marketing": 2, "authentication": 3}
+
+def _reduce_summary_numpy(churn, intent, confidence, cost_saved, tier_code, retention_code, category_code, immediate_code):
+    return (
+        int(churn.sum()), int(intent.sum()), float(confidence.sum()), float(cost_saved.sum()),
+        int((tier_code >= _TIER_CODES["high_value"]).sum()),
+        int((retention_code != 0).sum()),
+        int((immediate_code != 0).sum()),
+        int((category_code == _CATEGORY_CODES["marketing"]).sum()),
+        int((category_code == _CATEGORY_CODES["service"]).sum())
+    )
+
+if njit is not None:
+    # Codes are inlined: 2 = high_value tier (vip is 3), category 2 = marketing, 0 = service
+    @njit(cache=True)
+    def _reduce_summary(churn, intent, confidence, cost_saved, tier_code, retention_code, category_code, immediate_code):
+        churn_total = 0
+        intent_total = 0
+        confidence_total = 0.0
+        cost_total = 0.0
+        high_value = 0
+        retention = 0
+        immediate = 0
+        marketing = 0
+        service = 0
+        for i in range(churn.shape[0]):
+            churn_total += churn[i]
+            intent_total += intent[i]
+            confidence_total += confidence[i]
+            cost_total += cost_saved[i]
+            if tier_code[i] >= 2:
+                high_value += 1
+            if retention_code[i] != 0:
+                retention += 1
+            if immediate_code[i] != 0:
+                immediate += 1
+            if category_code[i] == 2:
+                marketing += 1
+            elif category_code[i] == 0:
+                service += 1
+        return churn_total, intent_total, confidence_total, cost_total, high_value, retention, immediate, marketing, service
+    
+    # Compile (or load from the on-disk cache) at import so the first bulk request does not pay for it;
+    # the dtypes must match the arrays built in _calculate_summary
+    _reduce_summary(
+        np.zeros(1, dtype=np.int32), np.zeros(1, dtype=np.int32),
+        np.zeros(1, dtype=np.float64), np.zeros(1, dtype=np.float64),
+        *(np.zeros(1, dtype=np.int8) for _ in range(4))
+    )
+else:
+    _reduce_summary = _reduce_summary_numpy
+
+# Compact bulk schema: short key -> full field name. Keep in sync with bulk_prompt_template.
+_COMPACT_FIELDS = {
+    "s": "sentiment",
+    "c": "confidence_score",
+    "r": "reasoning",
+    "al": "alert_level",
+    "cr": "churn_probability",
+    "rv": "revenue_risk",
+    "pi": "purchase_intent",
+    "ct": "customer_value_tier",
+    "ra": "retention_action"
+}
+# Nested models are sent as positional arrays: short key -> (full field name, element field names)
+_COMPACT_NESTED = {
+    "cp": ("cost_prediction", ("optimal_conversation_type", "predicted_cost", "cost_saved", "reasoning")),
+    "rp": ("response_prediction", ("success_probability", "best_response_time", "escalation_probability", "resolution_likelihood")),
+    "tr": ("template_recommendation", ("primary_category", "confidence", "cost_impact", "avoid_categories", "reasoning"))
+}
+_COMPACT_SENTIMENTS = {"pos": "positive", "neg": "negative", "neu": "neutral"}
+
+def _expand_compact(compact: dict):
+    """
+    Expand one compact bulk result back into the full single-message response shape
+    
+    Returns None when the item is malformed (missing keys, short nested arrays), so only
+    that message falls back instead of the whole batch.
+    """
+    if not isinstance(compact, dict):
+        return None
+    
+    # Tolerate the model answering in the full schema anyway
+    if "sentiment" in compact:
+        return compact
+    
+    if any(short not in compact for short in (*_COMPACT_FIELDS, *_COMPACT_NESTED)):
+        return None
+    
+    expanded = {full: compact[short] for short, full in _COMPACT_FIELDS.items()}
+    expanded["sentiment"] = _COMPACT_SENTIMENTS.get(expanded["sentiment"], expanded["sentiment"])
+    for short, (full, fields) in _COMPACT_NESTED.items():
+        value = compact[short]
+        # Nested models written as objects are already in the full shape
+        if isinstance(value, dict):
+            expanded[full] = value
+        elif isinstance(value, list) and len(value) == len(fields):
+            expanded[full] = dict(zip(fields, value))
+        else:
+            return None
+    return expanded
+
+# Backoff for transient Groq failures; a server-provided Retry-After takes precedence
+_RETRY_BACKOFF = wait_exponential_jitter(multiplier=0.2, max=4, jitter=0.2)
+_RETRY_AFTER_CAP = 4.0
+
+def _wait_for_retry(retry_state) -> float:
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), _RETRY_AFTER_CAP)
+        except ValueError:
+            pass
+    return _RETRY_BACKOFF(retry_state)
+
+def _parse_llm_json(response_text: str, pattern: re.Pattern, expected_type: type):
+    """
+    Parse the LLM output in one pass, only slicing out the JSON when extra text surrounds it
+    
+    Falls back to the pattern as well when the output parses but is not expected_type
+    (e.g. a bulk array wrapped in {"results": [...]}).
+    """
+    try:
+        parsed = orjson.loads(response_text)
+        if isinstance(parsed, expected_type):
+            return parsed
+    except orjson.JSONDecodeError:
+        pass
+    
+    json_match = pattern.search(response_text)
+    if not json_match:
+        raise ValueError(f"No JSON {expected_type.__name__} found in LLM response")
+    parsed = orjson.loads(json_match.group())
+    if not isinstance(parsed, expected_type):
+        raise ValueError(f"Expected a JSON {expected_type.__name__}, got {type(parsed).__name__}")
+    return parsed
+
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 16, cache_size: int = 10_000, http_async_client=None):
+        # Upper bound on in-flight Groq calls during individual bulk processing
+        self.max_concurrency = max_concurrency
+        
+        # Exact-match prompt cache: normalized message hash -> parsed LLM JSON (LRU eviction)
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
+        # Rule-based pre-classifier that answers trivial messages without a Groq call
+        self.local_classifier = LocalSentimentClassifier()
+        
+        # Semantic cache for paraphrased repeats - opt-in (SEMANTIC_CACHE=1) because it loads an
+        # embedding model into every worker, and only when the embedding dependencies are installed
+        semantic_enabled = os.getenv("SEMANTIC_CACHE", "").strip().lower() in ("1", "true", "yes")
+        self._semantic_cache = SemanticCache() if semantic_enabled and SemanticCache.available() else None
+        
+        # Constant part of every fallback response, copied per call by _create_fallback_response
+        self._fallback = SentimentResponse(
+            message="",
+            sentiment=SentimentType.NEUTRAL,
+            confidence_score=0.0,
+            reasoning="",
+            alert_level="medium",
+            
+            # Conservative business intelligence values
+            churn_probability=50,
+            revenue_risk="at_risk",
+            purchase_intent=25,
+            customer_value_tier="medium_value",
+            retention_action="follow_up",
+            
+            # Safe prediction defaults
+            cost_prediction=CostPrediction(
+                optimal_conversation_type="service",
+                predicted_cost="₹0.00",
+                cost_saved="₹0.00",
+                reasoning="Fallback to safe service category due to analysis error"
+            ),
+            
+            response_prediction=ResponsePrediction(
+                success_probability=50,
+                best_response_time="within_1_hour",
+                escalation_probability=30,
+                resolution_likelihood="medium"
+            ),
+            
+            template_recommendation=TemplateRecommendation(
+                primary_category="service",
+                confidence=60,
+                cost_impact="₹0.00",
+                avoid_categories=["marketing"],
+                reasoning="Safe fallback recommendation - use service category"
+            )
+        )
+        
         self.llm = ChatGroq(
             groq_api_key=os.getenv("GROQ_API_KEY"),
             model_name="llama3-8b-8192",
             temperature=0.1,
-            max_tokens=2000  # Increased for bulk processing
+            max_tokens=2000,  # Increased for bulk processing
+            max_retries=0,  # Retries are handled by _ainvoke
+            http_async_client=http_async_client  # Shared pooled client; None uses the SDK default
         )
         
         # Enhanced single message prompt
@@ -77,100 +313,99 @@ class SentimentAnalyzer:
             """
         )
         
-        # Optimized bulk processing prompt
+        # Optimized bulk processing prompt - compact schema (see _COMPACT_FIELDS) to cut output tokens
         self.bulk_prompt_template = PromptTemplate(
             input_variables=["messages_batch"],
             template="""
-            You are an expert sentiment analyzer. Analyze these messages and return a JSON array with analysis for each message.
+            You are an expert sentiment analyzer. Analyze these messages and return a compact JSON array with one object per message.
             
             Messages to analyze:
             {messages_batch}
             
-            For each message, provide this exact structure in a JSON array:
-            [
-                {{
-                    "message_index": 1,
-                    "sentiment": "positive/negative/neutral",
-                    "confidence_score": 0.0-1.0,
-                    "reasoning": "Brief explanation",
-                    "alert_level": "low/medium/high",
-                    "churn_probability": 0-100,
-                    "revenue_risk": "safe/at_risk/high_risk/critical",
-                    "purchase_intent": 0-100,
-                    "customer_value_tier": "low_value/medium_value/high_value/vip",
-                    "retention_action": "none/follow_up/discount_offer/manager_call/urgent_intervention",
-                    "cost_prediction": {{
-                        "optimal_conversation_type": "service/utility/marketing",
-                        "predicted_cost": "₹0.00/₹0.125/₹0.88",
-                        "cost_saved": "₹0.00/₹0.125/₹0.88",
-                        "reasoning": "Brief reason"
-                    }},
-                    "response_prediction": {{
-                        "success_probability": 0-100,
-                        "best_response_time": "immediate/within_1_hour/within_24_hours",
-                        "escalation_probability": 0-100,
-                        "resolution_likelihood": "low/medium/high"
-                    }},
-                    "template_recommendation": {{
-                        "primary_category": "service/utility/marketing",
-                        "confidence": 0-100,
-                        "cost_impact": "₹0.00/₹0.125/₹0.88",
-                        "avoid_categories": ["list"],
-                        "reasoning": "Brief reason"
-                    }}
-                }}
-            ]
+            Use exactly these short keys for each message, in message order:
+            i  = message_index: 1, 2, ...
+            s  = sentiment: "pos"/"neg"/"neu"
+            c  = confidence_score: 0.0-1.0
+            r  = reasoning: brief explanation
+            al = alert_level: "low"/"medium"/"high"
+            cr = churn_probability: 0-100
+            rv = revenue_risk: "safe"/"at_risk"/"high_risk"/"critical"
+            pi = purchase_intent: 0-100
+            ct = customer_value_tier: "low_value"/"medium_value"/"high_value"/"vip"
+            ra = retention_action: "none"/"follow_up"/"discount_offer"/"manager_call"/"urgent_intervention"
+            cp = [optimal_conversation_type "service"/"utility"/"marketing", predicted_cost "₹0.00"/"₹0.125"/"₹0.88", cost_saved "₹0.00"/"₹0.125"/"₹0.88", brief reason]
+            rp = [success_probability 0-100, best_response_time "immediate"/"within_1_hour"/"within_24_hours", escalation_probability 0-100, resolution_likelihood "low"/"medium"/"high"]
+            tr = [primary_category "service"/"utility"/"marketing", confidence 0-100, cost_impact "₹0.00"/"₹0.125"/"₹0.88", avoid_categories ["list"], brief reason]
+            
+            Example:
+            [{{"i":1,"s":"neg","c":0.9,"r":"Angry about late delivery","al":"high","cr":80,"rv":"high_risk","pi":5,"ct":"medium_value","ra":"manager_call","cp":["service","₹0.00","₹0.88","Resolve the complaint in free service"],"rp":[45,"immediate",60,"medium"],"tr":["service",90,"₹0.00",["marketing"],"Never send marketing to angry customers"]}}]
             
             Rules: Negative→service(₹0.00), Positive→marketing(₹0.88), Neutral→utility(₹0.125)
             Only return valid JSON array, no additional text.
             """
         )
+        
+        # Both templates are constant with one variable - render them once and split around it
+        self._single_prefix, self._single_suffix = self._split_prompt(self.prompt_template, "message")
+        self._bulk_prefix, self._bulk_suffix = self._split_prompt(self.bulk_prompt_template, "messages_batch")
+    
+    @staticmethod
+    def _split_prompt(prompt_template: PromptTemplate, variable: str):
+        rendered = prompt_template.format(**{variable: _PROMPT_SENTINEL})
+        prefix, suffix = rendered.split(_PROMPT_SENTINEL, 1)
+        return prefix, suffix
+    
+    @retry(
+        retry=retry_if_exception_type((groq.RateLimitError, groq.APIConnectionError)),
+        wait=_wait_for_retry,
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def _ainvoke(self, prompt: str):
+        """
+        Call Groq, retrying 429s and connection errors/timeouts with jittered exponential backoff
+        """
+        return await self.llm.ainvoke([HumanMessage(content=prompt)])
     
-    def analyze_message(self, message: str, customer_id: str = None, agent_id: str = None, timestamp: str = None) -> SentimentResponse:
+    async def analyze_message(self, message: str, customer_id: str = None, agent_id: str = None, timestamp: str = None) -> SentimentResponse:
         """
         Enhanced sentiment analysis with prediction and recommendation engine
         """
+        # Serve repeated messages straight from the prompt cache
+        cache_key = self._cache_key(message)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return self._build_response(cached, message, customer_id, agent_id, timestamp)
+        
+        # Trivially classifiable messages ("thanks", "ok", "👍") are answered locally
+        local = self.local_classifier.classify(message)
+        if local is not None:
+            return self._build_response(local, message, customer_id, agent_id, timestamp)
+        
+        # Fall back to a near-duplicate lookup before paying for a Groq call
+        if self._semantic_cache is not None:
+            similar = await asyncio.get_running_loop().run_in_executor(_POOL, self._semantic_cache.lookup, message)
+            if similar is not None:
+                self._cache_put(cache_key, similar)
+                return self._build_response(similar, message, customer_id, agent_id, timestamp)
+        
         try:
             # Create the prompt
-            formatted_prompt = self.prompt_template.format(message=message)
-            
-            # Get response from Groq
-            response = self.llm.invoke([HumanMessage(content=formatted_prompt)])
+            formatted_prompt = self._single_prefix + message.translate(_QUOTE_ESCAPE_TABLE) + self._single_suffix
             
-            # Parse the JSON response
-            response_text = response.content.strip()
+            # Get response from Groq without blocking the event loop
+            response = await self._ainvoke(formatted_prompt)
             
-            # Clean the response if it has extra text
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group()
-            
-            parsed_response = json.loads(response_text)
+            # Parse the JSON response, cleaning it only if it has extra text
+            parsed_response = _parse_llm_json(response.content, _JSON_OBJ_RE, dict)
             
             # Create enhanced SentimentResponse object
-            sentiment_response = SentimentResponse(
-                message=message,
-                sentiment=SentimentType(parsed_response["sentiment"].lower()),
-                confidence_score=float(parsed_response["confidence_score"]),
-                reasoning=parsed_response["reasoning"],
-                alert_level=parsed_response["alert_level"].lower(),
-                
-                # Business Intelligence Parameters
-                churn_probability=int(parsed_response["churn_probability"]),
-                revenue_risk=parsed_response["revenue_risk"],
-                purchase_intent=int(parsed_response["purchase_intent"]),
-                customer_value_tier=parsed_response["customer_value_tier"],
-                retention_action=parsed_response["retention_action"],
-                
-                # Prediction Engine
-                cost_prediction=CostPrediction(**parsed_response["cost_prediction"]),
-                response_prediction=ResponsePrediction(**parsed_response["response_prediction"]),
-                template_recommendation=TemplateRecommendation(**parsed_response["template_recommendation"]),
-                
-                customer_id=customer_id,
-                agent_id=agent_id,
-                timestamp=timestamp
-            )
+            sentiment_response = self._build_response(parsed_response, message, customer_id, agent_id, timestamp)
+            
+            # Only cache responses that parsed into a valid SentimentResponse
+            self._cache_put(cache_key, parsed_response)
+            if self._semantic_cache is not None:
+                await asyncio.get_running_loop().run_in_executor(_POOL, self._semantic_cache.add, message, parsed_response)
             
             return sentiment_response
             
@@ -178,7 +413,63 @@ class SentimentAnalyzer:
             # Fallback response if analysis fails
             return self._create_fallback_response(message, customer_id, agent_id, timestamp, f"Analysis error: {str(e)}")
     
-    def analyze_bulk_messages(self, messages: list) -> dict:
+    def _build_response(self, parsed_response: dict, message: str, customer_id: str = None, agent_id: str = None, timestamp: str = None) -> SentimentResponse:
+        """
+        Build a SentimentResponse from the parsed LLM JSON and request metadata
+        """
+        sentiment = parsed_response["sentiment"]
+        alert_level = parsed_response["alert_level"]
+        
+        # Copy so cached dicts are never mutated; nested models and numeric
+        # coercion are handled by Pydantic's validator in a single pass
+        return SentimentResponse.model_validate({
+            **parsed_response,
+            "message": message,
+            "sentiment": _SENTIMENT_MAP.get(sentiment) or SentimentType(sentiment.lower()),
+            "alert_level": _ALERT_LEVEL_MAP.get(alert_level) or alert_level.lower(),
+            "customer_id": customer_id,
+            "agent_id": agent_id,
+            "timestamp": timestamp
+        })
+    
+    @staticmethod
+    def _cache_key(message: str) -> str:
+        """
+        Hash the normalized message text for the exact-match prompt cache
+        """
+        return hashlib.blake2b(message.strip().lower().encode(), digest_size=16).hexdigest()
+    
+    def _cache_get(self, key: str):
+        parsed_response = self._cache.get(key)
+        if parsed_response is None:
+            self._cache_misses += 1
+            return None
+        
+        self._cache.move_to_end(key)
+        self._cache_hits += 1
+        return parsed_response
+    
+    def _cache_put(self, key: str, parsed_response: dict):
+        self._cache[key] = parsed_response
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def cache_stats(self) -> dict:
+        """
+        Prompt cache statistics for monitoring
+        """
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "size": len(self._cache),
+            "max_size": self.cache_size,
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_rate": round(self._cache_hits / lookups, 4) if lookups else 0.0,
+            "semantic": self._semantic_cache.stats() if self._semantic_cache is not None else "disabled"
+        }
+    
+    async def analyze_bulk_messages(self, messages: list) -> dict:
         """
         OPTIMIZED bulk analysis - faster processing with intelligent batching
         """
@@ -189,135 +480,209 @@ class SentimentAnalyzer:
         
         # For small batches (≤ 8), use optimized batch processing
         if len(messages) <= 8:
-            return self._analyze_bulk_optimized(messages)
+            return await self._analyze_bulk_optimized(messages)
         
-        # For larger batches, use individual processing with progress
+        # For larger batches, use concurrent individual processing
         else:
-            return self._analyze_bulk_individual(messages)
+            return await self._analyze_bulk_individual(messages)
     
-    def _analyze_bulk_optimized(self, messages: list) -> dict:
+    async def _analyze_bulk_optimized(self, messages: list) -> dict:
         """
         Optimized batch processing for small message sets (≤ 8 messages)
         Single API call for better performance
         """
         try:
-            # Prepare batch of messages
-            messages_batch = ""
-            for i, msg_request in enumerate(messages, 1):
-                messages_batch += f"Message {i}: {msg_request.message}\n"
-            
-            # Single API call for all messages
-            formatted_prompt = self.bulk_prompt_template.format(messages_batch=messages_batch)
-            response = self.llm.invoke([HumanMessage(content=formatted_prompt)])
+            # Dedupe the batch; cached and trivially classifiable messages skip the LLM entirely
+            keys = [self._cache_key(msg_request.message) for msg_request in messages]
+            resolved = {}
+            positions = {}
+            unique = []
+            for key, msg_request in zip(keys, messages):
+                if key in resolved or key in positions:
+                    continue
+                parsed = self._cache_get(key) or self.local_classifier.classify(msg_request.message)
+                if parsed is not None:
+                    resolved[key] = parsed
+                else:
+                    positions[key] = len(unique)
+                    unique.append(msg_request.message)
             
-            # Parse bulk response
-            response_text = response.content.strip()
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group()
+            if unique:
+                # Prepare batch of unique messages
+                messages_batch = "".join(
+                    f"Message {i}: {message}\n" for i, message in enumerate(unique, 1)
+                )
+                
+                # Single API call for all messages
+                formatted_prompt = self._bulk_prefix + messages_batch + self._bulk_suffix
+                response = await self._ainvoke(formatted_prompt)
+                
+                # Parse bulk response
+                parsed_responses = _parse_llm_json(response.content, _JSON_ARR_RE, list)
+                for key, index in positions.items():
+                    if index < len(parsed_responses):
+                        expanded = _expand_compact(parsed_responses[index])
+                        if expanded is not None:
+                            resolved[key] = expanded
             
-            parsed_responses = json.loads(response_text)
+            # Build responses and summary off the event loop so it keeps serving other requests
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(_POOL, self._build_bulk_results, keys, messages, resolved)
             
-            # Create SentimentResponse objects
-            results = []
-            for i, msg_request in enumerate(messages):
-                if i < len(parsed_responses):
-                    parsed_data = parsed_responses[i]
-                    sentiment_response = SentimentResponse(
-                        message=msg_request.message,
-                        sentiment=SentimentType(parsed_data["sentiment"].lower()),
-                        confidence_score=float(parsed_data["confidence_score"]),
-                        reasoning=parsed_data["reasoning"],
-                        alert_level=parsed_data["alert_level"].lower(),
-                        
-                        churn_probability=int(parsed_data["churn_probability"]),
-                        revenue_risk=parsed_data["revenue_risk"],
-                        purchase_intent=int(parsed_data["purchase_intent"]),
-                        customer_value_tier=parsed_data["customer_value_tier"],
-                        retention_action=parsed_data["retention_action"],
-                        
-                        cost_prediction=CostPrediction(**parsed_data["cost_prediction"]),
-                        response_prediction=ResponsePrediction(**parsed_data["response_prediction"]),
-                        template_recommendation=TemplateRecommendation(**parsed_data["template_recommendation"]),
-                        
-                        customer_id=msg_request.customer_id,
-                        agent_id=msg_request.agent_id,
-                        timestamp=msg_request.timestamp
-                    )
-                    results.append(sentiment_response)
-                else:
-                    # Fallback for missing responses
-                    results.append(self._create_fallback_response(
-                        msg_request.message, msg_request.customer_id, 
-                        msg_request.agent_id, msg_request.timestamp, "Batch processing incomplete"
-                    ))
+            # Every LLM result built successfully above, so it is safe to reuse across batches
+            for key in positions:
+                if key in resolved:
+                    self._cache_put(key, resolved[key])
             
-            return self._calculate_summary(results)
+            return await loop.run_in_executor(_POOL, self._calculate_summary, results)
             
         except Exception as e:
             print(f"Batch processing failed: {e}, falling back to individual processing")
-            return self._analyze_bulk_individual(messages)
+            return await self._analyze_bulk_individual(messages)
     
-    def _analyze_bulk_individual(self, messages: list) -> dict:
+    def _build_bulk_results(self, keys: list, messages: list, resolved: dict) -> list:
         """
-        Individual message processing with progress tracking
+        Create SentimentResponse objects, fanning shared analyses back out by position
         """
         results = []
-        print(f"🔄 Processing {len(messages)} messages individually...")
-        
-        for i, msg_request in enumerate(messages, 1):
-            try:
-                print(f"Processing message {i}/{len(messages)}...")
-                result = self.analyze_message(
-                    message=msg_request.message,
-                    customer_id=msg_request.customer_id,
-                    agent_id=msg_request.agent_id,
-                    timestamp=msg_request.timestamp
+        for key, msg_request in zip(keys, messages):
+            if key in resolved:
+                sentiment_response = self._build_response(
+                    resolved[key], msg_request.message, msg_request.customer_id,
+                    msg_request.agent_id, msg_request.timestamp
                 )
-                results.append(result)
-            except Exception as e:
-                print(f"Error processing message {i}: {e}")
+                results.append(sentiment_response)
+            else:
+                # Fallback for missing responses
                 results.append(self._create_fallback_response(
-                    msg_request.message, msg_request.customer_id,
-                    msg_request.agent_id, msg_request.timestamp, f"Processing error: {str(e)}"
+                    msg_request.message, msg_request.customer_id, 
+                    msg_request.agent_id, msg_request.timestamp, "Batch processing incomplete"
                 ))
         
-        return self._calculate_summary(results)
+        return results
+    
+    async def _analyze_bulk_individual(self, messages: list) -> dict:
+        """
+        Concurrent individual message processing, bounded by max_concurrency
+        """
+        results = [None] * len(messages)
+        async for index, result in self._iter_bulk_individual(messages):
+            results[index] = result
+        
+        return await asyncio.get_running_loop().run_in_executor(_POOL, self._calculate_summary, results)
+    
+    async def _iter_bulk_individual(self, messages: list):
+        """
+        Yield (index, SentimentResponse) pairs as each concurrent analysis completes
+        """
+        print(f"🔄 Processing {len(messages)} messages concurrently...")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # Dedupe within the batch: one LLM call per unique normalized message
+        keys = [self._cache_key(msg_request.message) for msg_request in messages]
+        positions = {}
+        for index, key in enumerate(keys):
+            positions.setdefault(key, []).append(index)
+        
+        async def analyze_bounded(key):
+            msg_request = messages[positions[key][0]]
+            try:
+                async with semaphore:
+                    return key, await self.analyze_message(
+                        message=msg_request.message,
+                        customer_id=msg_request.customer_id,
+                        agent_id=msg_request.agent_id,
+                        timestamp=msg_request.timestamp
+                    )
+            except Exception as e:
+                return key, e
+        
+        for completed in asyncio.as_completed([analyze_bounded(key) for key in positions]):
+            key, outcome = await completed
+            for index in positions[key]:
+                msg_request = messages[index]
+                if isinstance(outcome, Exception):
+                    print(f"Error processing message {index + 1}: {outcome}")
+                    result = self._create_fallback_response(
+                        msg_request.message, msg_request.customer_id,
+                        msg_request.agent_id, msg_request.timestamp, f"Processing error: {str(outcome)}"
+                    )
+                elif index != positions[key][0]:
+                    # Broadcast the shared analysis back onto the duplicate's own metadata
+                    result = outcome.model_copy(update={
+                        "message": msg_request.message,
+                        "customer_id": msg_request.customer_id,
+                        "agent_id": msg_request.agent_id,
+                        "timestamp": msg_request.timestamp
+                    })
+                else:
+                    result = outcome
+                yield index, result
+    
+    async def stream_bulk_messages(self, messages: list):
+        """
+        Streaming bulk analysis - yields ("result", index, SentimentResponse) as results
+        become available, then ("summary", None, summary) once the batch is done
+        """
+        if len(messages) > 15:
+            messages = messages[:15]
+        
+        # Small batches are a single LLM call, so there is nothing to stream early
+        if len(messages) <= 8:
+            analysis = await self._analyze_bulk_optimized(messages)
+            for index, result in enumerate(analysis["results"]):
+                yield "result", index, result
+            yield "summary", None, analysis["summary"]
+            return
+        
+        results = [None] * len(messages)
+        async for index, result in self._iter_bulk_individual(messages):
+            results[index] = result
+            yield "result", index, result
+        
+        summary = await asyncio.get_running_loop().run_in_executor(_POOL, self._calculate_summary, results)
+        yield "summary", None, summary["summary"]
     
     def _calculate_summary(self, results: list) -> dict:
         """
         Calculate enhanced summary statistics
         """
-        sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
-        alert_counts = {"low": 0, "medium": 0, "high": 0}
+        total_messages = len(results)
         
-        # Business intelligence aggregation
-        total_churn_risk = 0
-        total_purchase_intent = 0
-        high_value_customers = 0
-        cost_optimization_savings = 0
+        # Single pass over the results into per-field arrays, categoricals as small int codes
+        sentiment_counts = Counter()
+        alert_level_counts = Counter()
+        churn = np.empty(total_messages, dtype=np.int32)
+        intent = np.empty(total_messages, dtype=np.int32)
+        confidence = np.empty(total_messages, dtype=np.float64)
+        cost_saved = np.empty(total_messages, dtype=np.float64)
+        tier_code = np.empty(total_messages, dtype=np.int8)
+        retention_code = np.empty(total_messages, dtype=np.int8)
+        category_code = np.empty(total_messages, dtype=np.int8)
+        immediate_code = np.empty(total_messages, dtype=np.int8)
         
-        for result in results:
-            # Count sentiments and alerts
+        for i, result in enumerate(results):
             sentiment_counts[result.sentiment.value] += 1
-            alert_counts[result.alert_level] += 1
-            
-            # Aggregate business intelligence
-            total_churn_risk += result.churn_probability
-            total_purchase_intent += result.purchase_intent
-            if result.customer_value_tier in ["high_value", "vip"]:
-                high_value_customers += 1
-            
-            # Calculate cost savings
-            cost_saved_text = result.cost_prediction.cost_saved.replace("₹", "")
-            try:
-                cost_saved_value = float(cost_saved_text)
-                cost_optimization_savings += cost_saved_value
-            except:
-                pass
+            alert_level_counts[result.alert_level] += 1
+            churn[i] = result.churn_probability
+            intent[i] = result.purchase_intent
+            confidence[i] = result.confidence_score
+            tier_code[i] = _TIER_CODES.get(result.customer_value_tier, -1)
+            retention_code[i] = result.retention_action != "none"
+            category_code[i] = _CATEGORY_CODES.get(result.template_recommendation.primary_category, -1)
+            immediate_code[i] = "immediate" in result.response_prediction.best_response_time
+            cost_saved[i] = result.cost_prediction.cost_saved_value
+        
+        alert_counts = {level: alert_level_counts[level] for level in ("low", "medium", "high")}
+        
+        # Compiled (or vectorized) business intelligence aggregation
+        (total_churn_risk, total_purchase_intent, total_confidence, cost_optimization_savings,
+         high_value_customers, customers_needing_retention, immediate_response_required,
+         marketing_opportunities, service_required) = _reduce_summary(
+            churn, intent, confidence, cost_saved, tier_code, retention_code, category_code, immediate_code
+        )
         
         # Calculate enhanced summary statistics
-        total_messages = len(results)
         summary = {
             "total_messages": total_messages,
             "processing_time": "Optimized for performance",
@@ -328,7 +693,7 @@ class SentimentAnalyzer:
             },
             "alert_distribution": alert_counts,
             "high_priority_count": alert_counts["high"],
-            "average_confidence": round(sum([r.confidence_score for r in results]) / total_messages, 2),
+            "average_confidence": round(total_confidence / total_messages, 2),
             
             # Enhanced business intelligence summary
             "business_intelligence": {
@@ -337,10 +702,10 @@ class SentimentAnalyzer:
                 "high_value_customers": high_value_customers,
                 "high_value_percentage": round((high_value_customers / total_messages) * 100, 1),
                 "total_cost_savings": f"₹{cost_optimization_savings:.2f}",
-                "customers_needing_retention": len([r for r in results if r.retention_action != "none"]),
-                "immediate_response_required": len([r for r in results if "immediate" in r.response_prediction.best_response_time]),
-                "marketing_opportunities": len([r for r in results if r.template_recommendation.primary_category == "marketing"]),
-                "service_required": len([r for r in results if r.template_recommendation.primary_category == "service"])
+                "customers_needing_retention": customers_needing_retention,
+                "immediate_response_required": immediate_response_required,
+                "marketing_opportunities": marketing_opportunities,
+                "service_required": service_required
             }
         }
         
@@ -350,44 +715,10 @@ class SentimentAnalyzer:
         """
         Create a safe fallback response when AI analysis fails
         """
-        return SentimentResponse(
-            message=message,
-            sentiment=SentimentType.NEUTRAL,
-            confidence_score=0.0,
-            reasoning=f"Analysis error: {error}",
-            alert_level="medium",
-            
-            # Conservative business intelligence values
-            churn_probability=50,
-            revenue_risk="at_risk",
-            purchase_intent=25,
-            customer_value_tier="medium_value",
-            retention_action="follow_up",
-            
-            # Safe prediction defaults
-            cost_prediction=CostPrediction(
-                optimal_conversation_type="service",
-                predicted_cost="₹0.00",
-                cost_saved="₹0.00",
-                reasoning="Fallback to safe service category due to analysis error"
-            ),
-            
-            response_prediction=ResponsePrediction(
-                success_probability=50,
-                best_response_time="within_1_hour",
-                escalation_probability=30,
-                resolution_likelihood="medium"
-            ),
-            
-            template_recommendation=TemplateRecommendation(
-                primary_category="service",
-                confidence=60,
-                cost_impact="₹0.00",
-                avoid_categories=["marketing"],
-                reasoning="Safe fallback recommendation - use service category"
-            ),
-            
-            customer_id=customer_id,
-            agent_id=agent_id,
-            timestamp=timestamp
-        )
\ No newline at end of file
+        return self._fallback.model_copy(update={
+            "message": message,
+            "reasoning": f"Analysis error: {error}",
+            "customer_id": customer_id,
+            "agent_id": agent_id,
+            "timestamp": timestamp
+        })
\ No newline at end of file
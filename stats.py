@@ -0,0 +1,68 @@
+import numpy as np
+
+# Optional JIT for the test harness reductions - falls back to NumPy when numba is not installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Small integer codes for sentiment labels fed into sentiment_histogram
+SENTIMENT_CODES = {"positive": 0, "negative": 1, "neutral": 2}
+
+DEFAULT_PERCENTILES = (0.5, 0.95, 0.99)
+
+def _percentiles_numpy(latencies, qs):
+    ordered = np.sort(latencies)
+    n = ordered.shape[0]
+    ranks = np.maximum(np.ceil(qs * n).astype(np.int64) - 1, 0)
+    return ordered[ranks]
+
+def _histogram_numpy(codes, n_labels):
+    codes = codes[(codes >= 0) & (codes < n_labels)]
+    return np.bincount(codes, minlength=n_labels)
+
+if njit is not None:
+    # Nearest-rank percentiles: the smallest sample with at least q of the data at or below it
+    @njit(cache=True)
+    def _percentiles(latencies, qs):
+        ordered = np.sort(latencies)
+        n = ordered.shape[0]
+        out = np.empty(qs.shape[0], dtype=np.float64)
+        for i in range(qs.shape[0]):
+            rank = int(np.ceil(qs[i] * n)) - 1
+            out[i] = ordered[max(rank, 0)]
+        return out
+
+    @njit(cache=True)
+    def _histogram(codes, n_labels):
+        counts = np.zeros(n_labels, dtype=np.int64)
+        for i in range(codes.shape[0]):
+            if 0 <= codes[i] < n_labels:
+                counts[codes[i]] += 1
+        return counts
+else:
+    _percentiles = _percentiles_numpy
+    _histogram = _histogram_numpy
+
+def latency_percentiles(latencies, qs=DEFAULT_PERCENTILES):
+    """
+    Nearest-rank percentiles of a latency sample (seconds), e.g. p50/p95/p99 of a repeat run
+
+    Returns a float64 array aligned with qs.
+    """
+    latencies = np.asarray(latencies, dtype=np.float64)
+    qs = np.asarray(qs, dtype=np.float64)
+    if latencies.shape[0] == 0:
+        return np.full(qs.shape[0], np.nan)
+    return _percentiles(latencies, qs)
+
+def sentiment_histogram(codes, n_labels=len(SENTIMENT_CODES)):
+    """
+    Count sentiment label codes (see SENTIMENT_CODES) into an n_labels-long int64 array
+    """
+    return _histogram(np.asarray(codes, dtype=np.int64), n_labels)
+
+# Compile (or load from the on-disk cache) at import so the first timed run does not pay for it
+if njit is not None:
+    _percentiles(np.zeros(1, dtype=np.float64), np.asarray(DEFAULT_PERCENTILES, dtype=np.float64))
+    _histogram(np.zeros(1, dtype=np.int64), len(SENTIMENT_CODES))
@@ -1,158 +1,365 @@
-import requests
-import json
+import argparse
+import asyncio
+import httpx
+import orjson
+import sys
 import time
+import unittest
+from stats import SENTIMENT_CODES, latency_percentiles, sentiment_histogram
+
+# Optional Rust-backed (reqwest/Tokio) batch dispatcher for the fan-out stress case,
+# used only when selected with --dispatcher rusty-req (the pooled httpx client is the default)
+try:
+    import rusty_req
+except ImportError:
+    rusty_req = None
+
+# Optional client-side request coalescing for the batched single-message test
+try:
+    from async_batcher.batcher import AsyncBatcher
+except ImportError:
+    AsyncBatcher = None
 
 # Test the optimized API with performance measurements
 BASE_URL = "http://localhost:8000"
 
-def test_performance_improvements():
+# Connection pool shared by every test: keep-alive connections are reused instead of
+# paying a TCP (+TLS) handshake per request
+HTTP_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+
+# Fail fast when the server is not listening, but give slow LLM-backed responses room to finish
+TIMEOUT = httpx.Timeout(30, connect=1)
+
+# Transient gateway errors are retried with exponential backoff; connection failures are
+# retried by the transport itself
+RETRY_ATTEMPTS = 2
+RETRY_BACKOFF = 0.1
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+def create_client():
+    """Create the pooled client every test runs through"""
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=RETRY_ATTEMPTS)
+    return httpx.AsyncClient(base_url=BASE_URL, transport=transport, timeout=TIMEOUT)
+
+def _elapsed(start_ns):
+    """Seconds since a time.perf_counter_ns() reading (monotonic, ns resolution)"""
+    return (time.perf_counter_ns() - start_ns) / 1e9
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+async def request_with_retry(client, method, path, **kwargs):
+    """Send a request, retrying RETRY_STATUSES responses up to RETRY_ATTEMPTS times with exponential backoff"""
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        response = await client.request(method, path, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS:
+            return response
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+def post_json(client, path, payload):
+    """POST a payload serialized with orjson (faster than the client's stdlib json encoding); pre-serialized bodies are sent as-is"""
+    content = payload if isinstance(payload, (bytes, str)) else orjson.dumps(payload)
+    return request_with_retry(client, "POST", path, content=content, headers=JSON_HEADERS)
+
+# Static info endpoints (/ and /performance) don't change within a run - cache their JSON
+# in-process so repeated invocations from the same interpreter skip the network
+GET_CACHE_TTL = 60
+_GET_CACHE = {}
+
+async def _get_json(client, path):
+    """GET a static endpoint and return its parsed JSON (None on a non-200), cached for GET_CACHE_TTL seconds"""
+    cached = _GET_CACHE.get(path)
+    if cached is not None and time.monotonic() - cached[0] < GET_CACHE_TTL:
+        return cached[1]
+    
+    response = await request_with_retry(client, "GET", path)
+    if response.status_code != 200:
+        return None
+    
+    data = orjson.loads(response.content)
+    _GET_CACHE[path] = (time.monotonic(), data)
+    return data
+
+# Test payloads are constants - built and serialized once per process, not per test run
+# Small batch for optimized processing
+FAST_BATCH = {
+    "messages": [
+        {"message": "This service is terrible! I want refund immediately!", "customer_id": "fast_001"},
+        {"message": "Amazing product! Where can I buy the premium version?", "customer_id": "fast_002"},
+        {"message": "How do I track my order status?", "customer_id": "fast_003"},
+        {"message": "Your competitor has better pricing. Switching soon.", "customer_id": "fast_004"},
+        {"message": "Perfect experience! Will recommend to everyone!", "customer_id": "fast_005"},
+        {"message": "Technical issue with login. Please help.", "customer_id": "fast_006"},
+        {"message": "Outstanding customer support! Very satisfied!", "customer_id": "fast_007"},
+        {"message": "Website crashed during checkout. Frustrated!", "customer_id": "fast_008"}
+    ]
+}
+
+SINGLE_MESSAGES = [
+    "This is absolutely terrible! Cancel my subscription now!",
+    "Amazing service! Love everything about your platform!",
+    "Can you help me with my billing inquiry?"
+]
+
+AISENSY_TESTS = [
+    {
+        "message": "Bhai, tumhara service bilkul bakwas hai! Main complaint karna chahta hun!",
+        "customer_id": "aisensy_hindi_001",
+        "agent_id": "agent_priya"
+    },
+    {
+        "message": "Excellent support! Got my issue resolved in 5 minutes. Thank you!",
+        "customer_id": "aisensy_eng_002", 
+        "agent_id": "agent_rahul"
+    }
+]
+
+DEMO_BATCH = {
+    "messages": [
+        {"message": "This is absolutely terrible! Your delivery is 2 weeks late! I want full refund!", "customer_id": "demo_angry_vip"},
+        {"message": "Amazing Black Friday deals! Just bought 5 items. Love your store!", "customer_id": "demo_happy_shopper"},
+        {"message": "Can you help me track order #BF2024? Need it for my wedding tomorrow.", "customer_id": "demo_urgent_bride"},
+        {"message": "Your competitor Amazon has better prices. Why should I stay with you?", "customer_id": "demo_price_sensitive"},
+        {"message": "Perfect customer service! Solved my payment issue instantly. 5 stars!", "customer_id": "demo_satisfied_customer"}
+    ]
+}
+
+PAYLOADS = {
+    "warmup": {"message": "warmup", "customer_id": "w"},
+    "single": {"message": "Can you help me with my billing inquiry?", "customer_id": "stress_single"},
+    "fast": FAST_BATCH,
+    "demo": DEMO_BATCH
+}
+
+_PAYLOAD_BYTES = {name: orjson.dumps(payload) for name, payload in PAYLOADS.items()}
+_AISENSY_TESTS_BYTES = [orjson.dumps(test_data) for test_data in AISENSY_TESTS]
+
+# 20 messages - over the 15 message bulk limit
+_OVERSIZED_BATCH_JSON = '{"messages":[' + ','.join(['{"message":"x","customer_id":"t"}'] * 20) + ']}'
+
+async def run_case(client, path, payload):
+    """POST one test case and return (elapsed seconds, status code, body) - parsed JSON on a 200, raw text otherwise"""
+    start_ns = time.perf_counter_ns()
+    response = await post_json(client, path, payload)
+    elapsed = _elapsed(start_ns)
+    if response.status_code == 200:
+        return elapsed, response.status_code, orjson.loads(response.content)
+    return elapsed, response.status_code, response.text
+
+class CaseOutput:
+    """
+    Buffered output for one test: call it like print (text + "\\n"), record failures with fail()
+    
+    The buffer is written in one go by flush()/check(); check() then asserts that nothing failed,
+    so the same ❌ lines that are printed in script mode fail the test under pytest.
+    """
+    
+    def __init__(self):
+        self.buf = []
+        self.failures = []
+    
+    def __call__(self, text):
+        self.buf.append(text)
+    
+    def fail(self, text):
+        self.buf.append(text)
+        self.failures.append(text.strip())
+    
+    def flush(self):
+        sys.stdout.write("".join(self.buf))
+        self.buf.clear()
+    
+    def check(self):
+        self.flush()
+        assert not self.failures, "\n".join(self.failures)
+
+def report_case(p, label, outcome, fmt):
+    """Report a run_case outcome through the test's formatter, or as a uniform failure line"""
+    elapsed, status, body = outcome
+    if status == 200:
+        fmt(p, label, elapsed, body)
+    else:
+        p.fail(f"❌ {label} failed: {status} - {body}\n")
+
+async def test_performance_improvements(client):
     """Test performance optimizations"""
-    print("🚀 Testing Performance Optimized API...")
-    print("=" * 80)
+    # Each test collects its output and writes it once at the end instead of flushing per print line
+    p = CaseOutput()
+    p("🚀 Testing Performance Optimized API...\n")
+    p("=" * 80 + "\n")
     
     # Test API info
-    response = requests.get(f"{BASE_URL}/")
-    if response.status_code == 200:
-        info = response.json()
-        print(f"✅ API Version: {info['version']}")
-        print(f"✅ Features: {', '.join(info['features'])}")
-        print()
+    info = await _get_json(client, "/")
+    if info is not None:
+        p(f"✅ API Version: {info['version']}\n")
+        p(f"✅ Features: {', '.join(info['features'])}\n")
+    else:
+        p.fail("❌ API info unavailable\n")
+    p("\n")
+    p.check()
 
-def test_fast_bulk_processing():
+def _format_fast_bulk(p, label, processing_time, body):
+    summary = body["summary"]
+    if summary["total_messages"] != len(FAST_BATCH["messages"]):
+        p.fail(f"❌ {label} summarized {summary['total_messages']} of {len(FAST_BATCH['messages'])} messages\n")
+    p(f"✅ Fast Batch Processing Results:\n")
+    p(f"   Processing Time: {processing_time:.2f} seconds\n")
+    p(f"   Messages Processed: {summary['total_messages']}\n")
+    p(f"   Positive: {summary['sentiment_distribution']['positive_percentage']}%\n")
+    p(f"   Negative: {summary['sentiment_distribution']['negative_percentage']}%\n")
+    p(f"   High Priority Alerts: {summary['high_priority_count']}\n")
+    
+    if 'business_intelligence' in summary:
+        bi = summary['business_intelligence']
+        p(f"   Average Churn Risk: {bi['average_churn_risk']}%\n")
+        p(f"   Marketing Opportunities: {bi['marketing_opportunities']}\n")
+        p(f"   Service Required: {bi['service_required']}\n")
+    
+    p(f"✅ Performance: {'EXCELLENT' if processing_time < 15 else 'GOOD' if processing_time < 30 else 'NEEDS IMPROVEMENT'}\n")
+
+async def test_fast_bulk_processing(client):
     """Test optimized bulk processing (≤8 messages)"""
-    print("🧪 Testing Fast Bulk Processing (≤8 messages)...")
-    print("-" * 50)
-    
-    # Small batch for optimized processing
-    fast_batch = {
-        "messages": [
-            {"message": "This service is terrible! I want refund immediately!", "customer_id": "fast_001"},
-            {"message": "Amazing product! Where can I buy the premium version?", "customer_id": "fast_002"},
-            {"message": "How do I track my order status?", "customer_id": "fast_003"},
-            {"message": "Your competitor has better pricing. Switching soon.", "customer_id": "fast_004"},
-            {"message": "Perfect experience! Will recommend to everyone!", "customer_id": "fast_005"},
-            {"message": "Technical issue with login. Please help.", "customer_id": "fast_006"},
-            {"message": "Outstanding customer support! Very satisfied!", "customer_id": "fast_007"},
-            {"message": "Website crashed during checkout. Frustrated!", "customer_id": "fast_008"}
-        ]
-    }
+    p = CaseOutput()
+    p("🧪 Testing Fast Bulk Processing (≤8 messages)...\n")
+    p("-" * 50 + "\n")
     
-    start_time = time.time()
-    response = requests.post(f"{BASE_URL}/analyze-bulk", json=fast_batch)
-    end_time = time.time()
-    processing_time = end_time - start_time
+    # Warm-up request (discarded) so the timing below measures the hot path,
+    # not connection setup and the server's first-request costs
+    await post_json(client, "/analyze-sentiment", _PAYLOAD_BYTES["warmup"])
     
-    if response.status_code == 200:
-        result = response.json()
-        summary = result["summary"]
-        
-        print(f"✅ Fast Batch Processing Results:")
-        print(f"   Processing Time: {processing_time:.2f} seconds")
-        print(f"   Messages Processed: {summary['total_messages']}")
-        print(f"   Positive: {summary['sentiment_distribution']['positive_percentage']}%")
-        print(f"   Negative: {summary['sentiment_distribution']['negative_percentage']}%")
-        print(f"   High Priority Alerts: {summary['high_priority_count']}")
-        
-        if 'business_intelligence' in summary:
-            bi = summary['business_intelligence']
-            print(f"   Average Churn Risk: {bi['average_churn_risk']}%")
-            print(f"   Marketing Opportunities: {bi['marketing_opportunities']}")
-            print(f"   Service Required: {bi['service_required']}")
-        
-        print(f"✅ Performance: {'EXCELLENT' if processing_time < 15 else 'GOOD' if processing_time < 30 else 'NEEDS IMPROVEMENT'}")
-    else:
-        print(f"❌ Fast batch failed: {response.status_code} - {response.text}")
+    # Only the summary is reported, so skip transferring and parsing the per-message results
+    outcome = await run_case(client, "/analyze-bulk/summary", _PAYLOAD_BYTES["fast"])
+    report_case(p, "Fast batch", outcome, _format_fast_bulk)
     
-    print()
+    p("\n")
+    p.check()
+
+def _check_sentiment(p, label, result):
+    if result.get("sentiment") not in SENTIMENT_CODES:
+        p.fail(f"❌ {label} returned an unknown sentiment: {result.get('sentiment')!r}\n")
+
+def _format_single_message(p, label, processing_time, result):
+    _check_sentiment(p, label, result)
+    p(f"✅ {label}: {processing_time:.2f}s - {result['sentiment']} ({result['confidence_score']:.2f})\n")
+    p(f"   Churn Risk: {result['churn_probability']}% | Purchase Intent: {result['purchase_intent']}%\n")
+    p(f"   Recommended: {result['template_recommendation']['primary_category']} (Cost: {result['cost_prediction']['predicted_cost']})\n")
 
-def test_single_message_performance():
+async def test_single_message_performance(client):
     """Test single message analysis speed"""
-    print("🧪 Testing Single Message Performance...")
-    print("-" * 50)
+    p = CaseOutput()
+    p("🧪 Testing Single Message Performance...\n")
+    p("-" * 50 + "\n")
     
-    test_messages = [
-        "This is absolutely terrible! Cancel my subscription now!",
-        "Amazing service! Love everything about your platform!",
-        "Can you help me with my billing inquiry?"
+    async def labelled_case(label, payload):
+        return label, await run_case(client, "/analyze-sentiment", payload)
+    
+    # Fire all messages concurrently and record each one as it finishes (completion order);
+    # the block is written in one go by check() so it cannot interleave with the other tests
+    tasks = [
+        asyncio.create_task(labelled_case(f"Message {i}", {"message": message, "customer_id": f"perf_test_{i}"}))
+        for i, message in enumerate(SINGLE_MESSAGES, 1)
     ]
     
-    for i, message in enumerate(test_messages, 1):
-        start_time = time.time()
-        response = requests.post(
-            f"{BASE_URL}/analyze-sentiment",
-            json={"message": message, "customer_id": f"perf_test_{i}"}
-        )
-        end_time = time.time()
-        processing_time = end_time - start_time
+    for next_done in asyncio.as_completed(tasks):
+        label, outcome = await next_done
+        report_case(p, label, outcome, _format_single_message)
+    
+    p("\n")
+    p.check()
+
+if AsyncBatcher is not None:
+    class BulkSentimentBatcher(AsyncBatcher):
+        """
+        Coalesces concurrent single-message analyses into /analyze-bulk calls
         
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ Message {i}: {processing_time:.2f}s - {result['sentiment']} ({result['confidence_score']:.2f})")
-            print(f"   Churn Risk: {result['churn_probability']}% | Purchase Intent: {result['purchase_intent']}%")
-            print(f"   Recommended: {result['template_recommendation']['primary_category']} (Cost: {result['cost_prediction']['predicted_cost']})")
-        else:
-            print(f"❌ Message {i} failed: {response.status_code}")
+        Callers await process(payload) with an /analyze-sentiment payload and get back that
+        message's SentimentResponse; batches are capped at the server's optimized bulk size.
+        """
+        
+        def __init__(self, client, max_batch_size=8, **kwargs):
+            super().__init__(max_batch_size=max_batch_size, **kwargs)
+            self.client = client
+        
+        async def process_batch(self, batch):
+            response = await post_json(self.client, "/analyze-bulk", {"messages": batch})
+            response.raise_for_status()
+            # Bulk results come back in request order
+            return orjson.loads(response.content)["results"]
+else:
+    BulkSentimentBatcher = None
+
+async def test_batched_single_message_performance(client):
+    """Test single messages coalesced into bulk requests"""
+    p = CaseOutput()
+    p("🧪 Testing Batched Single Messages (coalesced into /analyze-bulk)...\n")
+    p("-" * 50 + "\n")
     
-    print()
+    if BulkSentimentBatcher is None:
+        p("⚠️ async-batcher not installed - skipping\n\n")
+        p.flush()
+        raise unittest.SkipTest("async-batcher not installed")
+    
+    batcher = BulkSentimentBatcher(client)
+    
+    async def batched_case(i, message):
+        start_ns = time.perf_counter_ns()
+        try:
+            result = await batcher.process({"message": message, "customer_id": f"batched_test_{i}"})
+        except httpx.HTTPStatusError as e:
+            return _elapsed(start_ns), e.response.status_code, e.response.text
+        return _elapsed(start_ns), 200, result
+    
+    try:
+        outcomes = await asyncio.gather(*[batched_case(i, message) for i, message in enumerate(SINGLE_MESSAGES, 1)])
+    finally:
+        # Every caller has its result - nothing left in the queue to drain
+        await batcher.stop(force=True)
+    
+    for i, outcome in enumerate(outcomes, 1):
+        report_case(p, f"Message {i}", outcome, _format_single_message)
+    
+    p("\n")
+    p.check()
+
+def _format_aisensy(p, label, processing_time, result):
+    _check_sentiment(p, label, result)
+    p(f"✅ {label}: {processing_time:.2f}s\n")
+    p(f"   Sentiment: {result['sentiment']} | Alert Required: {result['alert_required']}\n")
+    p(f"   Business Intelligence:\n")
+    p(f"     - Churn Risk: {result['business_intelligence']['churn_risk']}%\n")
+    p(f"     - Revenue Risk: {result['business_intelligence']['revenue_risk']}\n")
+    p(f"     - Customer Tier: {result['business_intelligence']['customer_tier']}\n")
+    p(f"   WhatsApp Optimization:\n")
+    p(f"     - Category: {result['whatsapp_optimization']['recommended_category']}\n")
+    p(f"     - Cost: {result['whatsapp_optimization']['predicted_cost']}\n")
+    p(f"     - Saved: {result['whatsapp_optimization']['cost_saved']}\n")
 
-def test_aisensy_integration_enhanced():
+async def test_aisensy_integration_enhanced(client):
     """Test enhanced AiSensy integration"""
-    print("🧪 Testing Enhanced AiSensy Integration...")
-    print("-" * 50)
-    
-    aisensy_tests = [
-        {
-            "message": "Bhai, tumhara service bilkul bakwas hai! Main complaint karna chahta hun!",
-            "customer_id": "aisensy_hindi_001",
-            "agent_id": "agent_priya"
-        },
-        {
-            "message": "Excellent support! Got my issue resolved in 5 minutes. Thank you!",
-            "customer_id": "aisensy_eng_002", 
-            "agent_id": "agent_rahul"
-        }
-    ]
+    p = CaseOutput()
+    p("🧪 Testing Enhanced AiSensy Integration...\n")
+    p("-" * 50 + "\n")
     
-    for i, test_data in enumerate(aisensy_tests, 1):
-        start_time = time.time()
-        response = requests.post(f"{BASE_URL}/aisensy/chat-analysis", json=test_data)
-        end_time = time.time()
-        processing_time = end_time - start_time
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ AiSensy Test {i}: {processing_time:.2f}s")
-            print(f"   Sentiment: {result['sentiment']} | Alert Required: {result['alert_required']}")
-            print(f"   Business Intelligence:")
-            print(f"     - Churn Risk: {result['business_intelligence']['churn_risk']}%")
-            print(f"     - Revenue Risk: {result['business_intelligence']['revenue_risk']}")
-            print(f"     - Customer Tier: {result['business_intelligence']['customer_tier']}")
-            print(f"   WhatsApp Optimization:")
-            print(f"     - Category: {result['whatsapp_optimization']['recommended_category']}")
-            print(f"     - Cost: {result['whatsapp_optimization']['predicted_cost']}")
-            print(f"     - Saved: {result['whatsapp_optimization']['cost_saved']}")
-        else:
-            print(f"❌ AiSensy Test {i} failed: {response.status_code}")
-        print()
-
-def test_performance_limits():
+    outcomes = await asyncio.gather(*[
+        run_case(client, "/aisensy/chat-analysis", test_data) for test_data in _AISENSY_TESTS_BYTES
+    ])
+    
+    for i, outcome in enumerate(outcomes, 1):
+        report_case(p, f"AiSensy Test {i}", outcome, _format_aisensy)
+        p("\n")
+    p.check()
+
+async def test_performance_limits(client):
     """Test performance limits and error handling"""
-    print("🧪 Testing Performance Limits...")
-    print("-" * 50)
-    
-    # Test message limit
-    large_batch = {
-        "messages": [
-            {"message": f"Test message number {i}", "customer_id": f"limit_test_{i}"}
-            for i in range(20)  # Over the 15 message limit
-        ]
-    }
+    p = CaseOutput()
+    p("🧪 Testing Performance Limits...\n")
+    p("-" * 50 + "\n")
     
-    response = requests.post(f"{BASE_URL}/analyze-bulk", json=large_batch)
+    # Test message limit - raw JSON body, the server rejects it before looking at the contents
+    response = await post_json(client, "/analyze-bulk", _OVERSIZED_BATCH_JSON)
     if response.status_code == 400:
-        print("✅ Message limit enforced: 15 messages max")
+        p("✅ Message limit enforced: 15 messages max\n")
     else:
-        print(f"❌ Message limit not working: {response.status_code}")
+        p.fail(f"❌ Message limit not working: {response.status_code}\n")
     
     # Test character limit
     long_message = {
@@ -160,119 +367,261 @@ def test_performance_limits():
         "customer_id": "char_limit_test"
     }
     
-    response = requests.post(f"{BASE_URL}/analyze-sentiment", json=long_message)
+    response = await post_json(client, "/analyze-sentiment", long_message)
     if response.status_code == 400:
-        print("✅ Character limit enforced: 2000 characters max")
+        p("✅ Character limit enforced: 2000 characters max\n")
     else:
-        print(f"❌ Character limit not working: {response.status_code}")
+        p.fail(f"❌ Character limit not working: {response.status_code}\n")
     
-    print()
+    p("\n")
+    p.check()
 
-def test_demo_scenario():
-    """Perfect demo scenario for hackathon"""
-    print("🎯 HACKATHON DEMO SCENARIO")
-    print("=" * 80)
-    
-    demo_batch = {
-        "messages": [
-            {"message": "This is absolutely terrible! Your delivery is 2 weeks late! I want full refund!", "customer_id": "demo_angry_vip"},
-            {"message": "Amazing Black Friday deals! Just bought 5 items. Love your store!", "customer_id": "demo_happy_shopper"},
-            {"message": "Can you help me track order #BF2024? Need it for my wedding tomorrow.", "customer_id": "demo_urgent_bride"},
-            {"message": "Your competitor Amazon has better prices. Why should I stay with you?", "customer_id": "demo_price_sensitive"},
-            {"message": "Perfect customer service! Solved my payment issue instantly. 5 stars!", "customer_id": "demo_satisfied_customer"}
-        ]
-    }
+def _format_demo(p, label, processing_time, body):
+    summary = body["summary"]
+    if summary["total_messages"] != len(DEMO_BATCH["messages"]):
+        p.fail(f"❌ {label} summarized {summary['total_messages']} of {len(DEMO_BATCH['messages'])} messages\n")
     
-    print("📱 Analyzing realistic AiSensy customer conversations...")
-    start_time = time.time()
-    response = requests.post(f"{BASE_URL}/analyze-bulk", json=demo_batch)
-    end_time = time.time()
+    p(f"\n🎉 DEMO RESULTS (Processed in {processing_time:.1f} seconds):\n")
+    p(f"📊 Customer Sentiment Distribution:\n")
+    p(f"   • Positive: {summary['sentiment_distribution']['positive_percentage']}% (Happy customers)\n")
+    p(f"   • Negative: {summary['sentiment_distribution']['negative_percentage']}% (Need immediate attention)\n")
+    p(f"   • Neutral: {summary['sentiment_distribution']['neutral_percentage']}% (Informational queries)\n")
     
-    if response.status_code == 200:
-        result = response.json()
-        summary = result["summary"]
-        
-        print(f"\n🎉 DEMO RESULTS (Processed in {end_time - start_time:.1f} seconds):")
-        print(f"📊 Customer Sentiment Distribution:")
-        print(f"   • Positive: {summary['sentiment_distribution']['positive_percentage']}% (Happy customers)")
-        print(f"   • Negative: {summary['sentiment_distribution']['negative_percentage']}% (Need immediate attention)")
-        print(f"   • Neutral: {summary['sentiment_distribution']['neutral_percentage']}% (Informational queries)")
-        
-        bi = summary['business_intelligence']
-        print(f"\n💼 Business Intelligence Insights:")
-        print(f"   • Average Churn Risk: {bi['average_churn_risk']}% (Revenue protection needed)")
-        print(f"   • Purchase Intent: {bi['average_purchase_intent']}% (Upselling opportunities)")
-        print(f"   • High-Value Customers: {bi['high_value_customers']} ({bi['high_value_percentage']}%)")
-        print(f"   • Immediate Response Required: {bi['immediate_response_required']} customers")
-        print(f"   • Marketing Opportunities: {bi['marketing_opportunities']} customers")
-        print(f"   • Service Required: {bi['service_required']} customers")
-        
-        print(f"\n💰 WhatsApp Cost Optimization:")
-        print(f"   • Total Cost Savings: {bi['total_cost_savings']}")
-        print(f"   • Smart conversation routing prevents wasted marketing spend")
-        
-        print(f"\n🚨 Actionable Alerts:")
-        print(f"   • High Priority: {summary['high_priority_count']} customers need immediate escalation")
-        print(f"   • Retention Actions: {bi['customers_needing_retention']} customers at risk")
-        
-        print(f"\n🎯 For AiSensy's 100,000+ businesses:")
-        print(f"   • Real-time sentiment monitoring across all WhatsApp conversations")
-        print(f"   • Automatic cost optimization for WhatsApp Business API")
-        print(f"   • Predictive customer intelligence for proactive service")
-        print(f"   • Multi-language support for global customer base")
-        
-    else:
-        print(f"❌ Demo failed: {response.status_code}")
+    bi = summary['business_intelligence']
+    p(f"\n💼 Business Intelligence Insights:\n")
+    p(f"   • Average Churn Risk: {bi['average_churn_risk']}% (Revenue protection needed)\n")
+    p(f"   • Purchase Intent: {bi['average_purchase_intent']}% (Upselling opportunities)\n")
+    p(f"   • High-Value Customers: {bi['high_value_customers']} ({bi['high_value_percentage']}%)\n")
+    p(f"   • Immediate Response Required: {bi['immediate_response_required']} customers\n")
+    p(f"   • Marketing Opportunities: {bi['marketing_opportunities']} customers\n")
+    p(f"   • Service Required: {bi['service_required']} customers\n")
+    
+    p(f"\n💰 WhatsApp Cost Optimization:\n")
+    p(f"   • Total Cost Savings: {bi['total_cost_savings']}\n")
+    p(f"   • Smart conversation routing prevents wasted marketing spend\n")
+    
+    p(f"\n🚨 Actionable Alerts:\n")
+    p(f"   • High Priority: {summary['high_priority_count']} customers need immediate escalation\n")
+    p(f"   • Retention Actions: {bi['customers_needing_retention']} customers at risk\n")
+    
+    p(f"\n🎯 For AiSensy's 100,000+ businesses:\n")
+    p(f"   • Real-time sentiment monitoring across all WhatsApp conversations\n")
+    p(f"   • Automatic cost optimization for WhatsApp Business API\n")
+    p(f"   • Predictive customer intelligence for proactive service\n")
+    p(f"   • Multi-language support for global customer base\n")
+
+async def test_demo_scenario(client):
+    """Perfect demo scenario for hackathon"""
+    p = CaseOutput()
+    p("🎯 HACKATHON DEMO SCENARIO\n")
+    p("=" * 80 + "\n")
+    
+    p("📱 Analyzing realistic AiSensy customer conversations...\n")
+    outcome = await run_case(client, "/analyze-bulk/summary", _PAYLOAD_BYTES["demo"])
+    report_case(p, "Demo", outcome, _format_demo)
+    p.check()
 
-def test_api_documentation():
+async def test_api_documentation(client):
     """Test API documentation endpoints"""
-    print("📚 Testing API Documentation...")
-    print("-" * 50)
+    p = CaseOutput()
+    p("📚 Testing API Documentation...\n")
+    p("-" * 50 + "\n")
     
-    response = requests.get(f"{BASE_URL}/performance")
-    if response.status_code == 200:
-        perf_info = response.json()
-        print("✅ Performance info available:")
-        print(f"   API Version: {perf_info['api_version']}")
-        print(f"   Response Time: {perf_info['performance_optimizations']['response_time']}")
-        print(f"   Business Features: {len(perf_info['business_intelligence_features'])} advanced features")
+    perf_info = await _get_json(client, "/performance")
+    if perf_info is not None:
+        p("✅ Performance info available:\n")
+        p(f"   API Version: {perf_info['api_version']}\n")
+        p(f"   Response Time: {perf_info['performance_optimizations']['response_time']}\n")
+        p(f"   Business Features: {len(perf_info['business_intelligence_features'])} advanced features\n")
+    else:
+        p.fail("❌ Performance info unavailable\n")
     
-    print("\n✅ Interactive docs available at: http://localhost:8000/docs")
-    print("✅ Health check available at: http://localhost:8000/health")
-    print()
+    p("\n✅ Interactive docs available at: http://localhost:8000/docs\n")
+    p("✅ Health check available at: http://localhost:8000/health\n")
+    p("\n")
+    p.check()
 
-if __name__ == "__main__":
-    print("🚀 Starting Optimized API Performance Tests...\n")
+def test_fast_bulk_benchmark(http, benchmark):
+    """Benchmark the optimized bulk path (≤8 messages) - pytest-benchmark handles warm-up and rounds"""
+    response = benchmark(http.post, "/analyze-bulk", content=_PAYLOAD_BYTES["fast"], headers=JSON_HEADERS)
+    assert response.status_code == 200
+
+def test_single_message_benchmark(http, benchmark):
+    """Benchmark a single /analyze-sentiment round trip"""
+    response = benchmark(http.post, "/analyze-sentiment", content=_PAYLOAD_BYTES["warmup"], headers=JSON_HEADERS)
+    assert response.status_code == 200
+
+# Stress mode (--repeat N): each case is POSTed N times back-to-back over the pooled connection,
+# to measure steady-state latency rather than a single cold call
+STRESS_CASES = (
+    ("single", "/analyze-sentiment"),
+    ("fast", "/analyze-bulk"),
+    ("demo", "/analyze-bulk")
+)
+
+def _stress_payload(payload, run):
+    """Copy of a stress payload with every message tagged by run number, so each run misses the exact-match cache"""
+    if "messages" in payload:
+        return {"messages": [{**message, "message": f"{message['message']} (run {run})"} for message in payload["messages"]]}
+    return {**payload, "message": f"{payload['message']} (run {run})"}
+
+async def run_stress(client, repeat):
+    """Run every stress case repeat times and report min/median/p95/max latency"""
+    buf = []
+    p = buf.append
+    p(f"🔥 Stress Mode: {repeat} runs per case\n")
+    p("-" * 50 + "\n")
     
-    # Test performance improvements
-    test_performance_improvements()
+    for name, path in STRESS_CASES:
+        # Serialized up front so the timed loop only pays for the request
+        payloads = [orjson.dumps(_stress_payload(PAYLOADS[name], run)) for run in range(repeat)]
+        latencies = []
+        sentiment_codes = []
+        failures = 0
+        for payload in payloads:
+            elapsed, status, body = await run_case(client, path, payload)
+            latencies.append(elapsed)
+            if status != 200:
+                failures += 1
+                continue
+            for result in body.get("results", (body,)):
+                sentiment_codes.append(SENTIMENT_CODES.get(result["sentiment"], -1))
+        
+        median, p95 = latency_percentiles(latencies, (0.5, 0.95))
+        positive, negative, neutral = sentiment_histogram(sentiment_codes)
+        p(f"✅ {name} ({path}): min {min(latencies):.3f}s | median {median:.3f}s | p95 {p95:.3f}s | max {max(latencies):.3f}s\n")
+        p(f"   Failures: {failures}/{repeat} | Sentiments: {positive} positive, {negative} negative, {neutral} neutral\n")
     
-    # Test fast bulk processing
-    test_fast_bulk_processing()
+    p("\n")
+    sys.stdout.write("".join(buf))
+
+# In-flight cap for the httpx fan-out - one request per pooled connection, so queued requests
+# wait on the semaphore (outside the timed section) instead of timing out on the pool
+FAN_OUT_CONCURRENCY = HTTP_LIMITS.max_connections
+
+async def fan_out_single_messages(client, count, dispatcher="httpx"):
+    """
+    POST count distinct single-message requests concurrently, via httpx or as one rusty-req batch
     
-    # Test single message performance
-    test_single_message_performance()
+    Returns (wall seconds, per-request latencies, failure count); timeouts and connection
+    errors count as failures instead of aborting the run.
+    """
+    payloads = [
+        {"message": f"Order #{i} has not arrived yet, can you check the status?", "customer_id": f"stress_customer_{i}"}
+        for i in range(count)
+    ]
+    start_ns = time.perf_counter_ns()
     
-    # Test enhanced AiSensy integration
-    test_aisensy_integration_enhanced()
+    if dispatcher == "rusty-req":
+        requests = [
+            rusty_req.RequestItem(url=f"{BASE_URL}/analyze-sentiment", method="POST", params=payload,
+                                  headers=JSON_HEADERS, tag=str(i), timeout=TIMEOUT.read)
+            for i, payload in enumerate(payloads)
+        ]
+        results = await rusty_req.fetch_requests(requests, mode=rusty_req.ConcurrencyMode.SELECT_ALL)
+        latencies = [float(result["meta"]["process_time"]) for result in results if result["http_status"] == 200]
+    else:
+        semaphore = asyncio.Semaphore(FAN_OUT_CONCURRENCY)
+        
+        async def bounded_case(payload):
+            async with semaphore:
+                try:
+                    return await run_case(client, "/analyze-sentiment", payload)
+                except httpx.TransportError as e:
+                    return None, None, repr(e)
+        
+        outcomes = await asyncio.gather(*[bounded_case(payload) for payload in payloads])
+        latencies = [elapsed for elapsed, status, _ in outcomes if status == 200]
     
-    # Test performance limits
-    test_performance_limits()
+    return _elapsed(start_ns), latencies, count - len(latencies)
+
+async def run_fan_out(client, count, dispatcher="httpx"):
+    """Report wall time, throughput and latency spread of a fan-out of count single-message requests"""
+    wall, latencies, failures = await fan_out_single_messages(client, count, dispatcher)
     
-    # Test documentation
-    test_api_documentation()
+    buf = []
+    p = buf.append
+    p(f"🔥 Fan-out: {count} concurrent single-message requests via {dispatcher}\n")
+    p("-" * 50 + "\n")
+    p(f"{'✅' if not failures else '⚠️'} Wall time: {wall:.2f}s | Throughput: {count / wall:.1f} req/s | Failures: {failures}/{count}\n")
+    if latencies:
+        median, p95 = latency_percentiles(latencies, (0.5, 0.95))
+        p(f"   Latency: min {min(latencies):.3f}s | median {median:.3f}s | p95 {p95:.3f}s | max {max(latencies):.3f}s\n")
+    p("\n")
+    sys.stdout.write("".join(buf))
+
+# Maximum number of test functions in flight at once when run as a script
+TEST_CONCURRENCY = 4
+
+async def main(repeat=0, fan_out=0, dispatcher="httpx"):
+    sys.stdout.write("🚀 Starting Optimized API Performance Tests...\n\n")
     
-    # Demo scenario for hackathon
-    test_demo_scenario()
+    # One pooled client for the whole run - with HTTP/2 (HTTPS deployments)
+    # concurrent requests multiplex over a single connection
+    async with create_client() as client:
+        # Run the tests concurrently (each writes its own buffered output), at most
+        # TEST_CONCURRENCY at a time so the server is not flooded
+        semaphore = asyncio.Semaphore(TEST_CONCURRENCY)
+        
+        async def run_test(test):
+            async with semaphore:
+                await test(client)
+        
+        tests = (
+            test_performance_improvements,
+            test_fast_bulk_processing,
+            test_single_message_performance,
+            test_batched_single_message_performance,
+            test_aisensy_integration_enhanced,
+            test_performance_limits,
+            test_api_documentation,
+            test_demo_scenario  # Demo scenario for hackathon
+        )
+        outcomes = await asyncio.gather(*[run_test(test) for test in tests], return_exceptions=True)
+        
+        # Failed checks have already printed their ❌ lines; crashes (unexpected response shape,
+        # transport errors) are reported here
+        failed = []
+        for test, outcome in zip(tests, outcomes):
+            if isinstance(outcome, unittest.SkipTest) or outcome is None:
+                continue
+            failed.append(test.__name__)
+            if not isinstance(outcome, AssertionError):
+                sys.stdout.write(f"❌ {test.__name__} crashed: {outcome!r}\n\n")
+        
+        if repeat > 0:
+            await run_stress(client, repeat)
+        
+        if fan_out > 0:
+            await run_fan_out(client, fan_out, dispatcher)
     
-    print("\n🏆 PERFORMANCE OPTIMIZATION COMPLETE!")
-    print("=" * 80)
-    print("✨ Your API now provides:")
-    print("   🚀 5x faster bulk processing (optimized batch processing)")
-    print("   📊 Advanced business intelligence with 8 key metrics")
-    print("   💰 WhatsApp conversation cost optimization")
-    print("   🎯 Template category recommendations")
-    print("   🌍 Multi-language support (Hindi/English)")
-    print("   ⚡ Performance limits for production stability")
-    print("   📈 Real-time churn prediction and revenue protection")
-    print("\n🎉 READY FOR HACKATHON PRESENTATION! 🎉")
\ No newline at end of file
+    buf = []
+    p = buf.append
+    p("\n🏆 PERFORMANCE OPTIMIZATION COMPLETE!\n")
+    p("=" * 80 + "\n")
+    p("✨ Your API now provides:\n")
+    p("   🚀 5x faster bulk processing (optimized batch processing)\n")
+    p("   📊 Advanced business intelligence with 8 key metrics\n")
+    p("   💰 WhatsApp conversation cost optimization\n")
+    p("   🎯 Template category recommendations\n")
+    p("   🌍 Multi-language support (Hindi/English)\n")
+    p("   ⚡ Performance limits for production stability\n")
+    p("   📈 Real-time churn prediction and revenue protection\n")
+    p("\n🎉 READY FOR HACKATHON PRESENTATION! 🎉\n")
+    if failed:
+        p(f"\n❌ {len(failed)} test(s) failed: {', '.join(failed)}\n")
+    sys.stdout.write("".join(buf))
+    return not failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Performance tests for the AiSensy Sentiment Analysis API")
+    parser.add_argument("--repeat", type=int, default=0,
+                        help="after the suite, POST each stress case N times back-to-back (a fresh message text per run) and report latency stats")
+    parser.add_argument("--fan-out", type=int, default=0,
+                        help="after the suite, fire N distinct single-message requests concurrently")
+    parser.add_argument("--dispatcher", choices=("httpx", "rusty-req"), default="httpx",
+                        help="HTTP client for --fan-out (rusty-req must be installed separately)")
+    args = parser.parse_args()
+    if args.dispatcher == "rusty-req" and rusty_req is None:
+        parser.error("--dispatcher rusty-req requires the rusty-req package (pip install rusty-req)")
+    sys.exit(0 if asyncio.run(main(args.repeat, args.fan_out, args.dispatcher)) else 1)
\ No newline at end of file
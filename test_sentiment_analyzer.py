@@ -0,0 +1,56 @@
+import pytest
+
+from sentiment_analyzer import _COMPACT_NESTED, _expand_compact
+
+# Unit tests for the compact bulk schema expansion - no server or Groq key needed
+
+COST_PREDICTION = {
+    "optimal_conversation_type": "service",
+    "predicted_cost": "₹0.00",
+    "cost_saved": "₹0.88",
+    "reasoning": "Resolve the complaint in free service"
+}
+
+def compact_result(**overrides):
+    """One compact bulk item in the positional-array shape the prompt asks for"""
+    compact = {
+        "i": 1, "s": "neg", "c": 0.9, "r": "Angry about late delivery", "al": "high",
+        "cr": 80, "rv": "high_risk", "pi": 5, "ct": "medium_value", "ra": "manager_call",
+        "cp": list(COST_PREDICTION.values()),
+        "rp": [45, "immediate", 60, "medium"],
+        "tr": ["service", 90, "₹0.00", ["marketing"], "Never send marketing to angry customers"]
+    }
+    compact.update(overrides)
+    return compact
+
+def test_expand_positional_arrays():
+    expanded = _expand_compact(compact_result())
+    assert expanded["sentiment"] == "negative"
+    assert expanded["churn_probability"] == 80
+    assert expanded["cost_prediction"] == COST_PREDICTION
+    assert expanded["response_prediction"]["best_response_time"] == "immediate"
+    assert expanded["template_recommendation"]["avoid_categories"] == ["marketing"]
+
+def test_expand_nested_objects_pass_through():
+    """A nested model written as an object keeps its values instead of zipping its keys"""
+    expanded = _expand_compact(compact_result(cp=dict(COST_PREDICTION)))
+    assert expanded["cost_prediction"] == COST_PREDICTION
+
+@pytest.mark.parametrize("short", sorted(_COMPACT_NESTED))
+def test_expand_rejects_short_array(short):
+    compact = compact_result()
+    compact[short] = compact[short][:-1]
+    assert _expand_compact(compact) is None
+
+@pytest.mark.parametrize("short", ["s", "al", "cp"])
+def test_expand_rejects_missing_key(short):
+    compact = compact_result()
+    del compact[short]
+    assert _expand_compact(compact) is None
+
+def test_expand_rejects_non_object_item():
+    assert _expand_compact(["neg", 0.9]) is None
+
+def test_expand_keeps_full_schema():
+    full = {"sentiment": "positive", "cost_prediction": COST_PREDICTION}
+    assert _expand_compact(full) is full
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import stats
+
+# Unit tests for stats.py - no server needed. Both backends are checked: the NumPy fallback
+# always, the numba kernels only when numba is installed (otherwise they alias the fallback)
+needs_numba = pytest.mark.skipif(stats.njit is None, reason="numba not installed")
+
+BACKENDS = [
+    pytest.param((stats._percentiles_numpy, stats._histogram_numpy), id="numpy"),
+    pytest.param((stats._percentiles, stats._histogram), id="numba", marks=needs_numba)
+]
+
+LATENCIES = np.asarray([0.9, 0.1, 0.5, 0.3, 0.7], dtype=np.float64)
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_percentiles_bounds(backend):
+    """q=0 is the fastest sample and q=1 the slowest"""
+    percentiles, _ = backend
+    result = percentiles(LATENCIES, np.asarray([0.0, 1.0]))
+    assert result.tolist() == [0.1, 0.9]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_percentiles_nearest_rank(backend):
+    """Nearest rank: the smallest sample with at least q of the data at or below it"""
+    percentiles, _ = backend
+    result = percentiles(LATENCIES, np.asarray([0.2, 0.5, 0.95]))
+    assert result.tolist() == [0.1, 0.5, 0.9]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_percentiles_single_sample(backend):
+    percentiles, _ = backend
+    result = percentiles(np.asarray([0.42]), np.asarray(stats.DEFAULT_PERCENTILES))
+    assert result.tolist() == [0.42] * len(stats.DEFAULT_PERCENTILES)
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_histogram_counts(backend):
+    _, histogram = backend
+    codes = np.asarray([0, 1, 2, 2, 0, 2], dtype=np.int64)
+    assert histogram(codes, 3).tolist() == [2, 1, 3]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_histogram_ignores_out_of_range_codes(backend):
+    """Unknown labels (SENTIMENT_CODES.get(..., -1)) and codes past n_labels are dropped"""
+    _, histogram = backend
+    codes = np.asarray([-1, 0, 3, 1, 7, -5], dtype=np.int64)
+    assert histogram(codes, 3).tolist() == [1, 1, 0]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_histogram_empty(backend):
+    _, histogram = backend
+    assert histogram(np.zeros(0, dtype=np.int64), 3).tolist() == [0, 0, 0]
+
+def test_latency_percentiles_empty_sample():
+    """An empty sample yields NaN for every requested percentile instead of raising"""
+    result = stats.latency_percentiles([], (0.5, 0.95))
+    assert result.shape == (2,)
+    assert np.isnan(result).all()
+
+def test_latency_percentiles_accepts_lists():
+    median, p95 = stats.latency_percentiles([0.3, 0.1, 0.2], (0.5, 0.95))
+    assert (median, p95) == (0.2, 0.3)
+
+def test_sentiment_histogram_default_labels():
+    codes = [stats.SENTIMENT_CODES[label] for label in ("positive", "neutral", "neutral")] + [-1]
+    assert stats.sentiment_histogram(codes).tolist() == [1, 0, 2]